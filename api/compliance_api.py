@@ -0,0 +1,169 @@
+# api/compliance_api.py
+# HTTP API over the compliance checks. Run from the repo root:
+#   uvicorn api.compliance_api:app --port 8000
+import os
+import sys
+import asyncio
+from datetime import date
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from fastapi import FastAPI, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse
+
+from modules.compliance_results import run_all_checks, check_error
+from modules.pii_scanner import SAMPLE_ROWS
+from modules.data_loader import DATA_DIR, REGISTRY_DATA
+from modules import job_queue
+from modules.cia_monitor import file_stat
+from modules.registry_store import REGISTRY_DB, query_models
+from modules.risk_registry import sync_registry
+from modules.risk_rules import RISK_RULES
+
+REPORT_PATH   = 'reports/compliance_report.pdf'
+CHECK_WORKERS = 4   # threads serving check results (cache hits are a stat() call)
+JOB_WORKERS   = 2   # queue worker processes for full PII scans and PDF generation
+
+@asynccontextmanager
+async def lifespan(app):
+    workers = job_queue.start_workers(JOB_WORKERS)
+    yield
+    for p in workers:
+        p.terminate()
+
+app = FastAPI(title="ML Compliance Suite API", lifespan=lifespan)
+
+_check_pool = ThreadPoolExecutor(max_workers=CHECK_WORKERS)
+
+def encode(obj):
+    # Check results carry numpy scalars (bools, int64) from pandas
+    return jsonable_encoder(obj, custom_encoder={np.generic: lambda v: v.item()})
+
+def _results(deep=False):
+    # Cache hits are a stat() per file and take no lock; concurrent misses
+    # on the same inputs run the checks once inside run_all_checks
+    return run_all_checks(deep=deep)
+
+def _data_source(source):
+    # Scan sources come from HTTP callers, so they must resolve inside the data directory
+    root = os.path.realpath(DATA_DIR)
+    resolved = os.path.realpath(source)
+    if os.path.commonpath([root, resolved]) != root:
+        raise HTTPException(status_code=400, detail=f'source must be inside {DATA_DIR}/')
+    return source
+
+# Inputs the registry store was last synced from in this process
+_registry_synced = {}
+
+def _registry_inputs():
+    # Registry CSV and rule file stat, the day, and the store file's inode
+    # (a deleted or rotated store needs a fresh sync)
+    return (file_stat(REGISTRY_DATA), file_stat(RISK_RULES), date.today().isoformat(),
+            (file_stat(REGISTRY_DB) or {}).get('inode'))
+
+def _query_registry(filters):
+    # Syncing reads and hashes the whole CSV, so only do it when an input moved
+    inputs = _registry_inputs()
+    if _registry_synced.get('inputs') != inputs:
+        sync_registry()
+        _registry_synced['inputs'] = _registry_inputs()
+    return query_models(**filters)
+
+async def get_results(deep=False):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_check_pool, _results, deep)
+
+async def check_result(name, deep=False):
+    results = await get_results(deep)
+    return encode(results[name])
+
+# ── Checks ─────────────────────────────────────────────────
+
+@app.get('/checks')
+async def checks_summary():
+    results = await get_results()
+    # A failed check reports its error in place of its summary
+    summaries = {
+        'bias': lambda r: r['status'],
+        'pii' : lambda r: r['status'],
+        'cia' : lambda r: r['integrity_status'],
+        'risk': lambda r: {'critical_models': r['critical_models'], 'total_models': r['total_models']},
+        'aop' : lambda r: {'completion_rate': r['completion_rate'], 'overdue': r['overdue']},
+    }
+    return encode({
+        **{name: check_error(results, name) or summary(results[name]) for name, summary in summaries.items()},
+        'timings': results['timings'],
+        'errors' : results['errors'],
+    })
+
+@app.get('/checks/bias')
+async def bias_check():
+    return await check_result('bias')
+
+@app.get('/checks/pii')
+async def pii_check():
+    return await check_result('pii')
+
+@app.get('/checks/cia')
+async def cia_check(deep: bool = False):
+    # deep=true re-hashes every monitored file instead of trusting stat()
+    return await check_result('cia', deep)
+
+@app.get('/registry')
+async def risk_registry(model_id: str = None, owner: str = None, department: str = None,
+                        risk_rating: str = None, due_within: int = None):
+    # With no filters: the full registry result. With filters: an indexed
+    # lookup in the registry store, e.g. ?risk_rating=CRITICAL&department=Retail%20Lending&due_within=30
+    filters = {'model_id': model_id, 'owner': owner, 'department': department,
+               'risk_rating': risk_rating, 'due_within': due_within}
+    if not any(v is not None for v in filters.values()):
+        return await check_result('risk')
+    loop = asyncio.get_running_loop()
+    models = await loop.run_in_executor(_check_pool, _query_registry, filters)
+    return encode(models)
+
+@app.get('/aop')
+async def aop_tracker():
+    return await check_result('aop')
+
+# ── Jobs ───────────────────────────────────────────────────
+
+@app.post('/checks/pii/scan')
+async def pii_scan(source: str = None, full: bool = True, priority: int = 0):
+    # full=true scans every row; otherwise wide tables are sampled as in /checks/pii.
+    # source is a directory or glob under data/
+    if source is not None:
+        source = _data_source(source)
+    job_id = job_queue.enqueue('pii-scan', priority, source=source,
+                               sample_rows=None if full else SAMPLE_ROWS)
+    return job_queue.job_status(job_id)
+
+@app.post('/report')
+async def create_report(priority: int = 0):
+    # Identical pending report requests coalesce into one job
+    return job_queue.job_status(job_queue.enqueue('report', priority))
+
+@app.get('/report')
+async def download_report():
+    if not os.path.exists(REPORT_PATH):
+        raise HTTPException(status_code=404, detail='No report generated yet; POST /report first')
+    return FileResponse(REPORT_PATH, media_type='application/pdf')
+
+@app.get('/jobs')
+async def list_jobs(status: str = None, limit: int = 50):
+    return job_queue.list_jobs(status, limit)
+
+@app.get('/jobs/{job_id}')
+async def get_job(job_id: int):
+    job = job_queue.job_status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f'Unknown job: {job_id}')
+    return job
+
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, port=8000)
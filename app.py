@@ -11,37 +11,31 @@ def main():
 
     print("\n[1] Running All Compliance Checks...\n")
 
-    # Run all modules
-    from modules.bias_detector  import run_bias_detection
-    from modules.pii_scanner    import run_pii_scan
-    from modules.cia_monitor    import run_cia_monitor
-    from modules.risk_registry  import run_risk_registry
-    from modules.aop_tracker    import run_aop_tracker
-    from modules.report_generator import generate_pdf_report
-
-    print("  → Bias Detection   :", end=' ')
-    bias = run_bias_detection()
-    print(f"{bias['status']} | Disparate Impact: {bias['disparate_impact_ratio']}")
-
-    print("  → PII Scanner      :", end=' ')
-    pii = run_pii_scan()
-    print(f"{pii['status']} | Issues: {pii['total_pii_fields']}")
-
-    print("  → CIA Monitor      :", end=' ')
-    cia = run_cia_monitor()
-    print(f"{cia['integrity_status']} | Files: {len(cia['integrity'])}")
-
-    print("  → Risk Registry    :", end=' ')
-    risk = run_risk_registry()
-    print(f"Critical: {risk['critical_models']} | Total: {risk['total_models']}")
-
-    print("  → AOP Tracker      :", end=' ')
-    aop = run_aop_tracker()
-    print(f"Completion: {aop['completion_rate']}% | Overdue: {aop['overdue']}")
-
-    print("\n[2] Generating PDF Report...")
-    report_path = generate_pdf_report()
-    print(f"  → Report saved: {report_path}")
+    # Run all modules once; the report and dashboard reuse these results
+    from modules.compliance_results import run_all_checks, check_error
+    from modules.job_queue import enqueue, start_workers
+
+    # --deep forces a full re-hash of the monitored files instead of the stat fast path
+    results = run_all_checks(deep='--deep' in sys.argv)
+
+    # A failed check prints its error in place of the summary line
+    summaries = [
+        ('Bias Detection', 'bias', lambda r: f"{r['status']} | Disparate Impact: {r['disparate_impact_ratio']}"),
+        ('PII Scanner',    'pii',  lambda r: f"{r['status']} | Issues: {r['total_pii_fields']}"),
+        ('CIA Monitor',    'cia',  lambda r: f"{r['integrity_status']} | Files: {len(r['integrity'])}"),
+        ('Risk Registry',  'risk', lambda r: f"Critical: {r['critical_models']} | Total: {r['total_models']}"),
+        ('AOP Tracker',    'aop',  lambda r: f"Completion: {r['completion_rate']}% | Overdue: {r['overdue']}"),
+    ]
+    for label, name, summary in summaries:
+        print(f"  → {label:<17}: {check_error(results, name) or summary(results[name])}")
+    print(f"  → Timings (s)      : {results['timings']}")
+
+    # The report is built by a background worker so the dashboard starts immediately;
+    # repeated launches while a report is still queued coalesce into one job
+    print("\n[2] Queueing PDF Report...")
+    job_id = enqueue('report')
+    start_workers(1, stop_when_idle=True)
+    print(f"  → Report job {job_id} queued (python -m modules.job_queue --status)")
 
     print("\n[3] Launching Dashboard...")
     print("  → Opening: http://localhost:8050")
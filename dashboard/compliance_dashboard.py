@@ -1,28 +1,32 @@
 # dashboard/compliance_dashboard.py
 import dash
-from dash import dcc, html, dash_table
+from dash import dcc, html, dash_table, Input, Output, State, no_update
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 import sys, os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from modules.bias_detector  import run_bias_detection
-from modules.pii_scanner    import run_pii_scan
-from modules.cia_monitor    import run_cia_monitor
-from modules.risk_registry  import run_risk_registry
-from modules.aop_tracker    import run_aop_tracker
-
-# ── Load Data ──────────────────────────────────────────────
-bias = run_bias_detection()
-pii  = run_pii_scan()
-cia  = run_cia_monitor()
-risk = run_risk_registry()
-aop  = run_aop_tracker()
+from modules.compliance_results import run_all_checks, check_error
+from dashboard.table_store import TableStore
+from dashboard.figure_cache import cached_figure
 
 # ── App Init ───────────────────────────────────────────────
+# Nothing is computed at import: the layout renders immediately and each
+# section fills itself through callbacks backed by the cached results store.
 app = dash.Dash(__name__, title="ML Compliance Suite | Bajaj Finance")
 
+REFRESH_MS = 60 * 1000
+
+# Section -> check results it is drawn from
+SECTIONS = {
+    'kpi'       : ['bias', 'pii', 'cia', 'risk', 'aop'],
+    'bias'      : ['bias'],
+    'risk-aop'  : ['risk', 'aop'],
+    'risk-table': ['risk'],
+    'pii-table' : ['pii'],
+}
+
 COLORS = {
     'bg'      : '#0d1117',
     'card'    : '#161b22',
@@ -74,88 +78,163 @@ def section_title(text):
 # ── Charts ─────────────────────────────────────────────────
 
 # 1. Gender Bias Bar
-gender_fig = go.Figure(go.Bar(
-    x=list(bias['gender_approval_rates'].keys()),
-    y=[round(v*100,1) for v in bias['gender_approval_rates'].values()],
-    marker_color=[COLORS['accent'], COLORS['red']],
-    text=[f"{round(v*100,1)}%" for v in bias['gender_approval_rates'].values()],
-    textposition='outside'
-))
-gender_fig.update_layout(
-    title='Gender Approval Rate (%)',
-    paper_bgcolor=COLORS['card'], plot_bgcolor=COLORS['card'],
-    font_color=COLORS['white'], height=300,
-    margin=dict(l=20, r=20, t=40, b=20),
-    yaxis=dict(gridcolor=COLORS['border']),
-)
+def build_gender_fig(bias):
+    gender_fig = go.Figure(go.Bar(
+        x=list(bias['gender_approval_rates'].keys()),
+        y=[round(v*100,1) for v in bias['gender_approval_rates'].values()],
+        marker_color=[COLORS['accent'], COLORS['red']],
+        text=[f"{round(v*100,1)}%" for v in bias['gender_approval_rates'].values()],
+        textposition='outside'
+    ))
+    gender_fig.update_layout(
+        title='Gender Approval Rate (%)',
+        paper_bgcolor=COLORS['card'], plot_bgcolor=COLORS['card'],
+        font_color=COLORS['white'], height=300,
+        margin=dict(l=20, r=20, t=40, b=20),
+        yaxis=dict(gridcolor=COLORS['border']),
+    )
+    return gender_fig
 
 # 2. City Approval Rate
-city_fig = go.Figure(go.Bar(
-    x=list(bias['city_approval_rates'].keys()),
-    y=[round(v*100,1) for v in bias['city_approval_rates'].values()],
-    marker_color=COLORS['accent'],
-))
-city_fig.update_layout(
-    title='City-wise Approval Rate (%)',
-    paper_bgcolor=COLORS['card'], plot_bgcolor=COLORS['card'],
-    font_color=COLORS['white'], height=300,
-    margin=dict(l=20, r=20, t=40, b=20),
-    yaxis=dict(gridcolor=COLORS['border']),
-)
+def build_city_fig(bias):
+    city_fig = go.Figure(go.Bar(
+        x=list(bias['city_approval_rates'].keys()),
+        y=[round(v*100,1) for v in bias['city_approval_rates'].values()],
+        marker_color=COLORS['accent'],
+    ))
+    city_fig.update_layout(
+        title='City-wise Approval Rate (%)',
+        paper_bgcolor=COLORS['card'], plot_bgcolor=COLORS['card'],
+        font_color=COLORS['white'], height=300,
+        margin=dict(l=20, r=20, t=40, b=20),
+        yaxis=dict(gridcolor=COLORS['border']),
+    )
+    return city_fig
 
 # 3. Risk Gauge
-avg_risk = round(sum(m['risk_score'] for m in risk['models']) / len(risk['models']))
-risk_gauge = go.Figure(go.Indicator(
-    mode='gauge+number',
-    value=avg_risk,
-    title={'text': 'Avg Risk Score', 'font': {'color': COLORS['white']}},
-    gauge={
-        'axis'      : {'range': [0, 100], 'tickcolor': COLORS['white']},
-        'bar'       : {'color': COLORS['red'] if avg_risk > 70 else COLORS['orange']},
-        'steps'     : [
-            {'range': [0,  40], 'color': '#1b5e20'},
-            {'range': [40, 70], 'color': '#e65100'},
-            {'range': [70,100], 'color': '#7f0000'},
-        ],
-        'threshold' : {'line': {'color': 'white', 'width': 3}, 'value': avg_risk}
-    }
-))
-risk_gauge.update_layout(
-    paper_bgcolor=COLORS['card'], font_color=COLORS['white'],
-    height=300, margin=dict(l=20, r=20, t=40, b=20)
-)
+def build_risk_gauge(risk):
+    avg_risk = round(risk['avg_risk_score'])
+    risk_gauge = go.Figure(go.Indicator(
+        mode='gauge+number',
+        value=avg_risk,
+        title={'text': 'Avg Risk Score', 'font': {'color': COLORS['white']}},
+        gauge={
+            'axis'      : {'range': [0, 100], 'tickcolor': COLORS['white']},
+            'bar'       : {'color': COLORS['red'] if avg_risk > 70 else COLORS['orange']},
+            'steps'     : [
+                {'range': [0,  40], 'color': '#1b5e20'},
+                {'range': [40, 70], 'color': '#e65100'},
+                {'range': [70,100], 'color': '#7f0000'},
+            ],
+            'threshold' : {'line': {'color': 'white', 'width': 3}, 'value': avg_risk}
+        }
+    ))
+    risk_gauge.update_layout(
+        paper_bgcolor=COLORS['card'], font_color=COLORS['white'],
+        height=300, margin=dict(l=20, r=20, t=40, b=20)
+    )
+    return risk_gauge
 
 # 4. AOP Pie
-aop_pie = go.Figure(go.Pie(
-    labels=['Completed', 'In Progress', 'Planned'],
-    values=[aop['completed'], aop['in_progress'], aop['planned']],
-    marker_colors=[COLORS['green'], COLORS['accent'], COLORS['yellow']],
-    hole=0.4,
-))
-aop_pie.update_layout(
-    title='AOP Review Status',
-    paper_bgcolor=COLORS['card'], font_color=COLORS['white'],
-    height=300, margin=dict(l=20, r=20, t=40, b=20)
-)
+def build_aop_pie(aop):
+    aop_pie = go.Figure(go.Pie(
+        labels=['Completed', 'In Progress', 'Planned'],
+        values=[aop['completed'], aop['in_progress'], aop['planned']],
+        marker_colors=[COLORS['green'], COLORS['accent'], COLORS['yellow']],
+        hole=0.4,
+    ))
+    aop_pie.update_layout(
+        title='AOP Review Status',
+        paper_bgcolor=COLORS['card'], font_color=COLORS['white'],
+        height=300, margin=dict(l=20, r=20, t=40, b=20)
+    )
+    return aop_pie
 
 # 5. Risk Registry Table
-risk_table_data = [{
-    'Model'     : m['model_name'],
-    'Dept'      : m['department'],
-    'Score'     : m['risk_score'],
-    'Rating'    : m['risk_rating'],
-    'Next Audit': m['next_audit'],
-    'Days Left' : m['days_to_audit'],
-} for m in risk['models']]
+def risk_table_data(risk):
+    return [{
+        'Model'     : m['model_name'],
+        'Dept'      : m['department'],
+        'Score'     : m['risk_score'],
+        'Rating'    : m['risk_rating'],
+        'Next Audit': m['next_audit'],
+        'Days Left' : m['days_to_audit'],
+    } for m in risk['models']]
+
+RISK_TABLE_COLUMNS = ['Model', 'Dept', 'Score', 'Rating', 'Next Audit', 'Days Left']
+RISK_NUMERIC       = ['Score', 'Days Left']
 
 # 6. PII Table
-pii_table_data = [{
-    'PII Type'  : f['pii_type'],
-    'Column'    : f['column'],
-    'Records'   : f['count'],
-    'Severity'  : f['severity'],
-    'Action'    : f['action'],
-} for f in pii['pii_findings']]
+def pii_table_data(pii):
+    return [{
+        'PII Type'  : f['pii_type'],
+        'Column'    : f['column'],
+        'Records'   : f['count'],
+        'Severity'  : f['severity'],
+        'Action'    : f['action'],
+    } for f in pii['pii_findings']]
+
+PII_TABLE_COLUMNS = ['PII Type', 'Column', 'Records', 'Severity', 'Action']
+PII_NUMERIC       = ['Records']
+
+# Tables page, filter and sort on the server; only one page of rows is sent
+TABLE_PAGE_SIZE = 10
+
+def table_columns(names, numeric):
+    return [{'name': c, 'id': c, 'type': 'numeric' if c in numeric else 'text'} for c in names]
+
+# ── Sections ───────────────────────────────────────────────
+
+def kpi_row(results):
+    # A failed check shows its error on its cards instead of values
+    cards = [
+        ("Bias Status",     'bias', lambda bias: (
+            bias['status'], COLORS['red'] if bias['status']=='FAIL' else COLORS['green'],
+            f"Disparate Impact: {bias['disparate_impact_ratio']}")),
+        ("PII Issues",      'pii',  lambda pii: (
+            pii['total_pii_fields'], COLORS['red'] if pii['critical_count']>0 else COLORS['orange'],
+            f"Critical: {pii['critical_count']}")),
+        ("CIA Status",      'cia',  lambda cia: (
+            cia['integrity_status'], COLORS['green'] if cia['integrity_status']=='PASS' else COLORS['red'],
+            f"Files Monitored: {len(cia['integrity'])}")),
+        ("Critical Models", 'risk', lambda risk: (
+            risk['critical_models'], COLORS['red'] if risk['critical_models']>0 else COLORS['green'],
+            f"Total: {risk['total_models']} models")),
+        ("AOP Completion",  'aop',  lambda aop: (
+            f"{aop['completion_rate']}%", COLORS['green'] if aop['completion_rate']>50 else COLORS['orange'],
+            f"{aop['completed']}/{aop['total_reviews']} reviews")),
+        ("Overdue Audits",  'aop',  lambda aop: (
+            aop['overdue'], COLORS['red'] if aop['overdue']>0 else COLORS['green'],
+            "Require immediate action")),
+    ]
+    row = []
+    for title, check, card in cards:
+        error = check_error(results, check)
+        row.append(kpi_card(title, 'ERROR', COLORS['red'], error) if error
+                   else kpi_card(title, *card(results[check])))
+    return row
+
+def error_fig(title, error):
+    fig = go.Figure()
+    fig.update_layout(
+        title=title,
+        paper_bgcolor=COLORS['card'], plot_bgcolor=COLORS['card'],
+        font_color=COLORS['white'], height=300,
+        margin=dict(l=20, r=20, t=40, b=20),
+        xaxis=dict(visible=False), yaxis=dict(visible=False),
+        annotations=[dict(text=error, showarrow=False, font=dict(color=COLORS['red']))],
+    )
+    return fig
+
+def bias_flag_list(bias, error=None):
+    if error:
+        return [html.P(error, style={'color': COLORS['red'], 'margin':'4px 0', 'fontSize':'13px'})]
+    return [
+        html.P(f"⚠ [{f['severity']}] {f['type']}: {f['detail']}",
+               style={'color': COLORS['red'], 'margin':'4px 0', 'fontSize':'13px'})
+        for f in bias['bias_flags']
+    ] + ([html.P("✅ No bias flags found",
+                 style={'color':COLORS['green']})] if not bias['bias_flags'] else [])
 
 # ── Layout ─────────────────────────────────────────────────
 app.layout = html.Div(style={
@@ -165,6 +244,10 @@ app.layout = html.Div(style={
     'padding'        : '24px',
 }, children=[
 
+    # Refresh timer and one version stamp per section
+    dcc.Interval(id='refresh', interval=REFRESH_MS, n_intervals=0),
+    *[dcc.Store(id=f'version-{name}') for name in SECTIONS],
+
     # Header
     html.Div([
         html.H1("🏦 ML Compliance & Governance Suite",
@@ -178,43 +261,18 @@ app.layout = html.Div(style={
 
     # KPI Row
     section_title("📊 Compliance Overview"),
-    html.Div([
-        kpi_card("Bias Status",    bias['status'],
-                 COLORS['red'] if bias['status']=='FAIL' else COLORS['green'],
-                 f"Disparate Impact: {bias['disparate_impact_ratio']}"),
-        kpi_card("PII Issues",     pii['total_pii_fields'],
-                 COLORS['red'] if pii['critical_count']>0 else COLORS['orange'],
-                 f"Critical: {pii['critical_count']}"),
-        kpi_card("CIA Status",     cia['integrity_status'],
-                 COLORS['green'] if cia['integrity_status']=='PASS' else COLORS['red'],
-                 f"Files Monitored: {len(cia['integrity'])}"),
-        kpi_card("Critical Models",risk['critical_models'],
-                 COLORS['red'] if risk['critical_models']>0 else COLORS['green'],
-                 f"Total: {risk['total_models']} models"),
-        kpi_card("AOP Completion", f"{aop['completion_rate']}%",
-                 COLORS['green'] if aop['completion_rate']>50 else COLORS['orange'],
-                 f"{aop['completed']}/{aop['total_reviews']} reviews"),
-        kpi_card("Overdue Audits", aop['overdue'],
-                 COLORS['red'] if aop['overdue']>0 else COLORS['green'],
-                 "Require immediate action"),
-    ], style={'display':'flex', 'gap':'12px', 'flexWrap':'wrap'}),
+    html.Div(id='kpi-row', style={'display':'flex', 'gap':'12px', 'flexWrap':'wrap'}),
 
     # Charts Row 1
     section_title("⚖️ Bias Detection"),
     html.Div([
-        html.Div(dcc.Graph(figure=gender_fig), style={'flex':'1'}),
-        html.Div(dcc.Graph(figure=city_fig),   style={'flex':'1'}),
+        html.Div(dcc.Graph(id='gender-fig'), style={'flex':'1'}),
+        html.Div(dcc.Graph(id='city-fig'),   style={'flex':'1'}),
     ], style={'display':'flex', 'gap':'16px'}),
 
     # Bias Flags
     html.Div([
-        html.Div([
-            html.P(f"⚠ [{f['severity']}] {f['type']}: {f['detail']}",
-                   style={'color': COLORS['red'], 'margin':'4px 0', 'fontSize':'13px'})
-            for f in bias['bias_flags']
-        ] + ([html.P("✅ No bias flags found",
-                     style={'color':COLORS['green']})] if not bias['bias_flags'] else [])
-        )
+        html.Div(id='bias-flags')
     ], style={
         'backgroundColor': COLORS['card'],
         'border'         : f'1px solid {COLORS["border"]}',
@@ -226,15 +284,18 @@ app.layout = html.Div(style={
     # Charts Row 2
     section_title("📈 Risk & AOP Overview"),
     html.Div([
-        html.Div(dcc.Graph(figure=risk_gauge), style={'flex':'1'}),
-        html.Div(dcc.Graph(figure=aop_pie),    style={'flex':'1'}),
+        html.Div(dcc.Graph(id='risk-gauge'), style={'flex':'1'}),
+        html.Div(dcc.Graph(id='aop-pie'),    style={'flex':'1'}),
     ], style={'display':'flex', 'gap':'16px'}),
 
     # Risk Registry Table
     section_title("🎯 Risk Registry"),
     dash_table.DataTable(
-        data=risk_table_data,
-        columns=[{'name': c, 'id': c} for c in risk_table_data[0].keys()],
+        id='risk-table',
+        columns=table_columns(RISK_TABLE_COLUMNS, RISK_NUMERIC),
+        page_action='custom', page_current=0, page_size=TABLE_PAGE_SIZE,
+        filter_action='custom', filter_query='',
+        sort_action='custom', sort_mode='multi', sort_by=[],
         style_table ={'overflowX': 'auto'},
         style_cell  ={
             'backgroundColor': COLORS['card'],
@@ -259,8 +320,11 @@ app.layout = html.Div(style={
     # PII Table
     section_title("🔐 PII Scanner Results"),
     dash_table.DataTable(
-        data=pii_table_data,
-        columns=[{'name': c, 'id': c} for c in pii_table_data[0].keys()],
+        id='pii-table',
+        columns=table_columns(PII_TABLE_COLUMNS, PII_NUMERIC),
+        page_action='custom', page_current=0, page_size=TABLE_PAGE_SIZE,
+        filter_action='custom', filter_query='',
+        sort_action='custom', sort_mode='multi', sort_by=[],
         style_table ={'overflowX': 'auto'},
         style_cell  ={
             'backgroundColor': COLORS['card'],
@@ -288,5 +352,91 @@ app.layout = html.Div(style={
     ], style={'marginTop': '40px', 'borderTop': f'1px solid {COLORS["border"]}', 'paddingTop': '16px'}),
 ])
 
+# ── Callbacks ──────────────────────────────────────────────
+
+@app.callback(
+    [Output(f'version-{name}', 'data') for name in SECTIONS],
+    Input('refresh', 'n_intervals'),
+    [State(f'version-{name}', 'data') for name in SECTIONS],
+)
+def refresh_versions(_, *current):
+    # Only sections whose inputs changed get a new stamp; the rest return
+    # no_update, so their render callbacks never fire. Checks come from the
+    # cached results store and only rerun when a monitored file changes; the
+    # per-check digests are stored with them, so a tick hashes nothing.
+    versions = run_all_checks()['versions']
+    stamps = []
+    for (name, checks), old in zip(SECTIONS.items(), current):
+        new = '-'.join(versions[c] for c in checks)
+        stamps.append(new if new != old else no_update)
+    return stamps
+
+@app.callback(Output('kpi-row', 'children'), Input('version-kpi', 'data'),
+              prevent_initial_call=True)
+def render_kpis(_):
+    return kpi_row(run_all_checks())
+
+@app.callback(
+    Output('gender-fig', 'figure'), Output('city-fig', 'figure'), Output('bias-flags', 'children'),
+    Input('version-bias', 'data'),
+    prevent_initial_call=True,
+)
+def render_bias(version):
+    results = run_all_checks()
+    if error := check_error(results, 'bias'):
+        return (error_fig('Gender Approval Rate (%)', error), error_fig('City-wise Approval Rate (%)', error),
+                bias_flag_list(None, error))
+    bias = results['bias']
+    return (cached_figure('gender', version, lambda: build_gender_fig(bias)),
+            cached_figure('city',   version, lambda: build_city_fig(bias)),
+            bias_flag_list(bias))
+
+@app.callback(
+    Output('risk-gauge', 'figure'), Output('aop-pie', 'figure'),
+    Input('version-risk-aop', 'data'),
+    prevent_initial_call=True,
+)
+def render_risk_aop(version):
+    results = run_all_checks()
+    risk_error, aop_error = check_error(results, 'risk'), check_error(results, 'aop')
+    return (error_fig('Avg Risk Score', risk_error) if risk_error else
+            cached_figure('risk-gauge', version, lambda: build_risk_gauge(results['risk'])),
+            error_fig('AOP Review Status', aop_error) if aop_error else
+            cached_figure('aop-pie',    version, lambda: build_aop_pie(results['aop'])))
+
+# Indexed row stores for the server-side tables, rebuilt only when the
+# section version changes
+TABLES = {
+    'risk-table': ('risk', risk_table_data, RISK_TABLE_COLUMNS),
+    'pii-table' : ('pii',  pii_table_data,  PII_TABLE_COLUMNS),
+}
+_table_stores = {}
+
+def table_store(table, version):
+    cached = _table_stores.get(table)
+    if cached is None or cached[0] != version:
+        check, rows, columns = TABLES[table]
+        results = run_all_checks()
+        # A failed check leaves its table empty; its error shows on the KPI cards
+        cached = (version, TableStore([] if check_error(results, check) else rows(results[check]), columns))
+        _table_stores[table] = cached
+    return cached[1]
+
+def _register_table(table):
+    @app.callback(
+        Output(table, 'data'), Output(table, 'page_count'),
+        Input(f'version-{table}', 'data'),
+        Input(table, 'page_current'), Input(table, 'page_size'),
+        Input(table, 'sort_by'), Input(table, 'filter_query'),
+        prevent_initial_call=True,
+    )
+    def render_table(version, page_current, page_size, sort_by, filter_query):
+        return table_store(table, version).query(filter_query, sort_by, page_current, page_size)
+    return render_table
+
+render_risk_table = _register_table('risk-table')
+render_pii_table  = _register_table('pii-table')
+
+
 if __name__ == '__main__':
     app.run(debug=True, port=8050)
\ No newline at end of file
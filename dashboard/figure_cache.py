@@ -0,0 +1,55 @@
+# dashboard/figure_cache.py
+import os
+import json
+import time
+import sqlite3
+from contextlib import contextmanager
+
+# Serialized Plotly figures shared by every Dash worker process. Keys combine
+# the figure name with the hash of the results it is drawn from, so a figure
+# is built once per dataset version no matter how many viewers load it.
+FIGURE_CACHE = 'database/figure_cache.db'
+MAX_FIGURES  = 256
+
+@contextmanager
+def _connect(path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10)
+    try:
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('CREATE TABLE IF NOT EXISTS figures '
+                     '(key TEXT PRIMARY KEY, figure TEXT NOT NULL, last_used REAL NOT NULL)')
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+def get_figure(key, path=FIGURE_CACHE):
+    with _connect(path) as conn:
+        row = conn.execute('SELECT figure FROM figures WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute('UPDATE figures SET last_used = ? WHERE key = ?', (time.time(), key))
+    return json.loads(row[0])
+
+def put_figure(key, figure, path=FIGURE_CACHE, max_entries=MAX_FIGURES):
+    text = figure if isinstance(figure, str) else figure.to_json()
+    with _connect(path) as conn:
+        conn.execute('INSERT OR REPLACE INTO figures VALUES (?, ?, ?)', (key, text, time.time()))
+        # LRU eviction: keep only the most recently used entries
+        conn.execute('DELETE FROM figures WHERE key NOT IN '
+                     '(SELECT key FROM figures ORDER BY last_used DESC LIMIT ?)', (max_entries,))
+    return json.loads(text)
+
+def cached_figure(name, version, build, path=FIGURE_CACHE):
+    # build() is only called on a miss; version None (no dataset hash) is never cached
+    if version is None:
+        return build()
+    key = f"{name}:{version}"
+    figure = get_figure(key, path)
+    return figure if figure is not None else put_figure(key, build(), path)
+
+def clear_figure_cache(path=FIGURE_CACHE):
+    if os.path.exists(path):
+        with _connect(path) as conn:
+            conn.execute('DELETE FROM figures')
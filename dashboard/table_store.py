@@ -0,0 +1,118 @@
+# dashboard/table_store.py
+import re
+import math
+
+import numpy as np
+import pandas as pd
+
+# Dash filter_query clauses look like "{Score} >= 50" or "{Rating} scontains HIGH";
+# the s/i prefix selects case sensitivity
+CLAUSE   = re.compile(r'^\{(?P<col>[^}]+)\}\s+(?P<op>\S+)\s*(?P<value>.*)$')
+OPERATOR = {'=': 'eq', '!=': 'ne', '<': 'lt', '<=': 'le', '>': 'gt', '>=': 'ge'}
+CASED_OPS = ('eq', 'ne', 'lt', 'le', 'gt', 'ge', 'contains')
+
+def parse_filter(filter_query):
+    clauses = []
+    for part in (filter_query or '').split(' && '):
+        match = CLAUSE.match(part.strip())
+        if not match:
+            continue
+        op = OPERATOR.get(match['op'], match['op'])
+        insensitive = False
+        if op[0] in 'si' and op[1:] in CASED_OPS:
+            insensitive, op = op[0] == 'i', op[1:]
+        value = match['value'].strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'`':
+            value = value[1:-1]
+        clauses.append((match['col'], op, value, insensitive))
+    return clauses
+
+class TableStore:
+    # Row store behind a server-side DataTable. Each column keeps a lazily
+    # built sorted index, so equality/range filters are binary searches and
+    # sorting reuses the same order; only the requested page leaves the server.
+
+    def __init__(self, records, columns):
+        self.frame   = pd.DataFrame(records, columns=columns)
+        self.columns = list(columns)
+        self.values  = {}
+        for col in self.columns:
+            series = self.frame[col]
+            numeric = pd.api.types.is_numeric_dtype(series)
+            self.values[col] = series.to_numpy(float) if numeric else series.astype(str).to_numpy(object)
+        self._order = {}
+
+    def __len__(self):
+        return len(self.frame)
+
+    def order(self, col):
+        if col not in self._order:
+            order = np.argsort(self.values[col], kind='stable')
+            self._order[col] = (order, self.values[col][order])
+        return self._order[col]
+
+    def _coerce(self, col, value):
+        if self.values[col].dtype == float:
+            try:
+                return float(value)
+            except ValueError:
+                return None
+        return value
+
+    def _clause_mask(self, col, op, value, insensitive):
+        n = len(self)
+        mask = np.zeros(n, dtype=bool)
+        if col not in self.values:
+            return ~mask
+        column = self.values[col]
+
+        if op in ('contains', 'datestartswith') or (insensitive and column.dtype != float):
+            text = pd.Series(column).astype(str)
+            if insensitive:
+                text, value = text.str.lower(), value.lower()
+            if op == 'contains':
+                return text.str.contains(value, regex=False).to_numpy()
+            if op == 'datestartswith':
+                return text.str.startswith(value).to_numpy()
+            column = text.to_numpy(object)
+            return {'eq': column == value, 'ne': column != value, 'lt': column < value,
+                    'le': column <= value, 'gt': column > value, 'ge': column >= value}.get(op, ~mask)
+
+        value = self._coerce(col, value)
+        if value is None:
+            return mask
+        order, ordered = self.order(col)
+        lo = np.searchsorted(ordered, value, side='left')
+        hi = np.searchsorted(ordered, value, side='right')
+        spans = {'eq': [(lo, hi)], 'ne': [(0, lo), (hi, n)], 'lt': [(0, lo)],
+                 'le': [(0, hi)], 'gt': [(hi, n)], 'ge': [(lo, n)]}
+        if op not in spans:
+            return ~mask
+        for start, stop in spans[op]:
+            mask[order[start:stop]] = True
+        return mask
+
+    def query(self, filter_query=None, sort_by=None, page_current=0, page_size=10):
+        selected = np.ones(len(self), dtype=bool)
+        for clause in parse_filter(filter_query):
+            selected &= self._clause_mask(*clause)
+
+        sort_by = [s for s in (sort_by or []) if s['column_id'] in self.values]
+        if len(sort_by) == 1:
+            order = self.order(sort_by[0]['column_id'])[0]
+            if sort_by[0]['direction'] == 'desc':
+                order = order[::-1]
+            rows = order[selected[order]]
+        elif sort_by:
+            subset = self.frame[selected]
+            rows = subset.sort_values([s['column_id'] for s in sort_by],
+                                      ascending=[s['direction'] == 'asc' for s in sort_by],
+                                      kind='stable').index.to_numpy()
+        else:
+            rows = np.flatnonzero(selected)
+
+        page_size  = max(int(page_size or 1), 1)
+        page_count = max(math.ceil(len(rows) / page_size), 1)
+        start = (page_current or 0) * page_size
+        page  = self.frame.iloc[rows[start:start + page_size]]
+        return page.to_dict('records'), page_count
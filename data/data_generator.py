@@ -2,6 +2,10 @@ import pandas as pd
 import numpy as np
 import random
 import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.schema import apply_schema
 
 np.random.seed(42)
 random.seed(42)
@@ -57,7 +61,7 @@ def generate_loan_dataset(n=1000):
             'loan_approved'      : approved
         })
 
-    df = pd.DataFrame(data)
+    df = apply_schema(pd.DataFrame(data))
     os.makedirs('data', exist_ok=True)
     df.to_csv('data/loan_data.csv', index=False)
     print("  [OK] Loan Dataset       : 1000 records -> data/loan_data.csv")
@@ -1,90 +1,95 @@
 # modules/aop_tracker.py
+import os
+import tempfile
+import numpy as np
 import pandas as pd
-from datetime import datetime, date
+from datetime import date
+from modules.data_loader import load_aop_data
+from modules.registry_store import (REGISTRY_DB, content_key, get_meta,
+                                    write_reviews, query_reviews, review_summary)
 
-def run_aop_tracker():
-    df = pd.read_csv('data/aop_data.csv')
-    today = date.today()
-    results = []
+STATUS_CLASSES = {'Completed': ('GREEN', 'DONE'), 'In Progress': ('BLUE', 'ONGOING')}
+SEVERITY_COLORS = {'High': 'RED', 'Medium': 'ORANGE', 'Low': 'YELLOW'}
+DUE_SOON_DAYS = 30
 
-    for _, row in df.iterrows():
-        # Days calculation
-        try:
-            planned = datetime.strptime(row['planned_date'], '%Y-%m-%d').date()
-            days_from_today = (planned - today).days
-        except:
-            days_from_today = None
+def _text(series):
+    # str() of every value, as the row loop did (NaN -> 'nan')
+    return series.astype(object).map(str).to_numpy(dtype=object)
 
-        # Completion check
-        completed = str(row['completed_date']).strip() not in ['', 'nan', 'NaT']
+def classify_reviews(df, today):
+    # Columnar urgency / status-colour / severity-colour classification for
+    # every review at once; planned_date is parsed once for the whole column
+    planned = pd.to_datetime(df['planned_date'], format='%Y-%m-%d', errors='coerce')
+    days    = (planned - pd.Timestamp(today)).dt.days.to_numpy(dtype=float)
+    known   = ~np.isnan(days)
 
-        # Status color
-        status = str(row['status'])
-        if status == 'Completed':
-            status_color = 'GREEN'
-            urgency      = 'DONE'
-        elif status == 'In Progress':
-            status_color = 'BLUE'
-            urgency      = 'ONGOING'
-        elif days_from_today is not None and days_from_today < 0:
-            status_color = 'RED'
-            urgency      = 'OVERDUE'
-        elif days_from_today is not None and days_from_today <= 30:
-            status_color = 'ORANGE'
-            urgency      = 'DUE SOON'
-        else:
-            status_color = 'YELLOW'
-            urgency      = 'UPCOMING'
+    completed = ~np.isin(np.char.strip(_text(df['completed_date']).astype(str)), ['', 'nan', 'NaT'])
+    status    = _text(df['status'])
+    severity  = _text(df['severity'])
 
-        # Severity color
-        severity = str(row['severity'])
-        if severity == 'High':
-            sev_color = 'RED'
-        elif severity == 'Medium':
-            sev_color = 'ORANGE'
-        elif severity == 'Low':
-            sev_color = 'YELLOW'
-        else:
-            sev_color = 'GREY'
+    conditions = [status == s for s in STATUS_CLASSES] + [known & (days < 0), known & (days <= DUE_SOON_DAYS)]
+    status_color = np.select(conditions, [c for c, _ in STATUS_CLASSES.values()] + ['RED', 'ORANGE'], 'YELLOW')
+    urgency      = np.select(conditions, [u for _, u in STATUS_CLASSES.values()] + ['OVERDUE', 'DUE SOON'], 'UPCOMING')
+    sev_color    = np.select([severity == s for s in SEVERITY_COLORS], list(SEVERITY_COLORS.values()), 'GREY')
 
-        results.append({
-            'review_id'     : row['review_id'],
-            'model_name'    : row['model_name'],
-            'review_type'   : row['review_type'],
-            'planned_date'  : row['planned_date'],
-            'completed_date': row['completed_date'] if completed else 'Pending',
-            'status'        : status,
-            'status_color'  : status_color,
-            'urgency'       : urgency,
-            'reviewer'      : row['reviewer'],
-            'findings'      : row['findings'],
-            'severity'      : severity,
-            'sev_color'     : sev_color,
-            'quarter'       : row['quarter'],
-            'remarks'       : row['remarks'],
-            'days_from_today': days_from_today,
-            'completed'     : completed
-        })
+    return {
+        'review_id'      : df['review_id'].tolist(),
+        'model_id'       : df['model_id'].tolist() if 'model_id' in df else [None] * len(df),
+        'model_name'     : df['model_name'].tolist(),
+        'review_type'    : df['review_type'].tolist(),
+        'planned_date'   : df['planned_date'].tolist(),
+        'completed_date' : np.where(completed, df['completed_date'].to_numpy(dtype=object), 'Pending').tolist(),
+        'status'         : status.tolist(),
+        'status_color'   : status_color.tolist(),
+        'urgency'        : urgency.tolist(),
+        'reviewer'       : df['reviewer'].tolist(),
+        'findings'       : df['findings'].tolist(),
+        'severity'       : severity.tolist(),
+        'sev_color'      : sev_color.tolist(),
+        'quarter'        : df['quarter'].tolist(),
+        'remarks'        : df['remarks'].tolist(),
+        'days_from_today': [int(d) if k else None for d, k in zip(days.tolist(), known.tolist())],
+        'completed'      : completed.tolist(),
+    }
+
+def run_aop_tracker(df=None, today=None, store=None):
+    # Reviews are classified and synced into the registry store only when the
+    # AOP data (or the day) changed; counts come from aggregate queries.
+    # The store defaults to REGISTRY_DB only for the AOP CSV itself; any other
+    # frame without an explicit store goes through a throwaway one.
+    if df is None:
+        df = load_aop_data()
+        store = store or REGISTRY_DB
+    if store is None:
+        with tempfile.TemporaryDirectory(prefix='aop_') as tmp:
+            return run_aop_tracker(df, today, os.path.join(tmp, 'reviews.db'))
+    today = today or date.today()
+
+    key = content_key(df, today)
+    if get_meta('reviews_key', store) != key:
+        write_reviews(classify_reviews(df, today), key, store)
 
-    # Quarter Summary
-    q1 = [r for r in results if r['quarter'] == 'Q1']
-    q2 = [r for r in results if r['quarter'] == 'Q2']
+    # One aggregate pass for the counts and one GROUP BY over every
+    # (year, quarter) in the review history
+    counts, by_year = review_summary(store)
+    quarters = {}
+    for (year, quarter), q in by_year.items():
+        total = quarters.setdefault(quarter, {'reviews': 0, 'completed': 0})
+        total['reviews']   += q['reviews']
+        total['completed'] += q['completed']
+    q1 = quarters.get('Q1', {'reviews': 0, 'completed': 0})
+    q2 = quarters.get('Q2', {'reviews': 0, 'completed': 0})
 
     summary = {
-        'total_reviews'    : len(results),
-        'completed'        : sum(1 for r in results if r['completed']),
-        'in_progress'      : sum(1 for r in results if r['status'] == 'In Progress'),
-        'planned'          : sum(1 for r in results if r['status'] == 'Planned'),
-        'overdue'          : sum(1 for r in results if r['urgency'] == 'OVERDUE'),
-        'due_soon'         : sum(1 for r in results if r['urgency'] == 'DUE SOON'),
-        'high_severity'    : sum(1 for r in results if r['severity'] == 'High'),
-        'total_findings'   : sum(r['findings'] for r in results),
-        'q1_reviews'       : len(q1),
-        'q1_completed'     : sum(1 for r in q1 if r['completed']),
-        'q2_reviews'       : len(q2),
-        'q2_completed'     : sum(1 for r in q2 if r['completed']),
-        'completion_rate'  : round(sum(1 for r in results if r['completed']) / len(results) * 100, 1),
-        'reviews'          : results
+        **counts,
+        'q1_reviews'       : q1['reviews'],
+        'q1_completed'     : q1['completed'],
+        'q2_reviews'       : q2['reviews'],
+        'q2_completed'     : q2['completed'],
+        'completion_rate'  : round(counts['completed'] / counts['total_reviews'] * 100, 1),
+        'quarters'         : quarters,
+        'quarters_by_year' : {f"{year}-{quarter}" if year else quarter: q for (year, quarter), q in by_year.items()},
+        'reviews'          : query_reviews(store)
     }
 
     return summary
@@ -107,5 +112,5 @@ if __name__ == '__main__':
     for r in res['reviews']:
         print(f"{r['review_id']:<8} {r['model_name']:<30} {r['review_type']:<25} {r['status']:<12} {r['urgency']:<10} {r['severity']}")
     print()
-    print(f"Q1: {res['q1_completed']}/{res['q1_reviews']} completed")
-    print(f"Q2: {res['q2_completed']}/{res['q2_reviews']} completed")
\ No newline at end of file
+    for quarter, q in res['quarters_by_year'].items():
+        print(f"{quarter}: {q['completed']}/{q['reviews']} completed")
\ No newline at end of file
@@ -1,51 +1,200 @@
 # modules/bias_detector.py
 import pandas as pd
 import numpy as np
+from modules.data_loader import load_loan_data, iter_loan_chunks, BIAS_COLUMNS
 
-def run_bias_detection(df=None):
+GROUP_COLUMNS = ['gender', 'city', 'education']
+
+DI_THRESHOLD       = 0.8    # RBI threshold
+CITY_STD_THRESHOLD = 0.05
+
+MIN_GROUP_DECISIONS = 1      # below this, a gender group is too small to compare
+
+CI_METHODS          = ('bootstrap', 'analytic')
+BOOTSTRAP_RESAMPLES = 10_000
+CONFIDENCE          = 0.95
+
+def accumulate_group_counts(counts, df):
+    # Running approved/total counts per group; memory grows with groups, not rows
+    for col in GROUP_COLUMNS:
+        grouped = df.groupby(col, observed=True)['loan_approved'].agg(['sum', 'count'])
+        acc = counts.setdefault(col, {})
+        for group, approved, total in zip(grouped.index, grouped['sum'], grouped['count']):
+            prev = acc.get(group, (0, 0))
+            acc[group] = (prev[0] + int(approved), prev[1] + int(total))
+    prev = counts.get('overall', (0, 0))
+    # Rows with no recorded outcome are left out, as groupby's count does above
+    counts['overall'] = (prev[0] + int(df['loan_approved'].sum()), prev[1] + int(df['loan_approved'].count()))
+    return counts
+
+def _approval_rates(acc):
+    return pd.Series({g: approved / total for g, (approved, total) in sorted(acc.items())}, dtype=float)
+
+# ── Confidence intervals ──────────────────────────────────
+# Both methods work from the per-group counts alone, so they cost the same
+# for streamed and in-memory data. The bootstrap resamples the dataset as
+# group sizes ~ Multinomial(N, n_g / N) and approvals ~ Binomial(size_g, p_g),
+# which is equivalent to resampling rows without ever materialising them.
+
+def bootstrap_group_rates(acc, resamples=BOOTSTRAP_RESAMPLES, seed=0):
+    groups   = sorted(acc)
+    approved = np.array([acc[g][0] for g in groups], dtype=float)
+    n        = np.array([acc[g][1] for g in groups], dtype=np.int64)
+    rng      = np.random.default_rng(seed)
+    sizes    = rng.multinomial(n.sum(), n / n.sum(), size=resamples)
+    hits     = rng.binomial(sizes, approved / n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return groups, hits / sizes
+
+def _percentile_ci(samples, confidence, axis=0):
+    tail = (1 - confidence) / 2 * 100
+    lo, hi = np.nanpercentile(samples, [tail, 100 - tail], axis=axis)
+    return lo, hi
+
+def wilson_ci(approved, total, confidence=CONFIDENCE):
+    from statistics import NormalDist
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = approved / total
+    centre = (p + z * z / (2 * total)) / (1 + z * z / total)
+    half   = z * np.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / (1 + z * z / total)
+    return centre - half, centre + half
+
+def _ratio_ci_analytic(a1, n1, a2, n2, confidence=CONFIDENCE):
+    # Delta method on log(p1 / p2). A group with no approvals makes the log
+    # undefined, so both groups get the usual 0.5 continuity correction then.
+    from statistics import NormalDist
+    z  = NormalDist().inv_cdf(0.5 + confidence / 2)
+    if a1 == 0 or a2 == 0:
+        a1, n1, a2, n2 = a1 + 0.5, n1 + 1, a2 + 0.5, n2 + 1
+    p1, p2 = a1 / n1, a2 / n2
+    se = np.sqrt((1 - p1) / (n1 * p1) + (1 - p2) / (n2 * p2))
+    ratio = p1 / p2
+    return ratio * np.exp(-z * se), ratio * np.exp(z * se)
+
+def _std_ci_analytic(acc, confidence=CONFIDENCE):
+    # Delta method on the std of the group rates, each rate having binomial
+    # variance p(1 - p) / n
+    from statistics import NormalDist
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    approved = np.array([a for a, _ in acc.values()], dtype=float)
+    n        = np.array([t for _, t in acc.values()], dtype=float)
+    p   = approved / n
+    std = p.std(ddof=1)
+    if std == 0:
+        return 0.0, 0.0
+    grad = (p - p.mean()) / ((len(p) - 1) * std)
+    se   = np.sqrt(np.sum(grad * grad * p * (1 - p) / n))
+    return max(std - z * se, 0.0), std + z * se
+
+def bias_intervals(counts, method='bootstrap', resamples=BOOTSTRAP_RESAMPLES, confidence=CONFIDENCE, seed=0):
+    gender, city = counts.get('gender', {}), counts.get('city', {})
+    intervals = {'method': method, 'confidence': confidence}
+
+    if method == 'bootstrap':
+        groups, rates = bootstrap_group_rates(gender, resamples, seed)
+        if 'Male' in groups and 'Female' in groups:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                di = rates[:, groups.index('Female')] / rates[:, groups.index('Male')]
+            intervals['disparate_impact'] = _percentile_ci(di, confidence)
+
+        groups, rates = bootstrap_group_rates(city, resamples, seed + 1)
+        lo, hi = _percentile_ci(rates, confidence)
+        intervals['city_rates'] = {g: (lo[i], hi[i]) for i, g in enumerate(groups)}
+        if len(groups) > 1:
+            intervals['city_std'] = _percentile_ci(np.nanstd(rates, axis=1, ddof=1), confidence)
+    else:
+        if 'Male' in gender and 'Female' in gender:
+            intervals['disparate_impact'] = _ratio_ci_analytic(*gender['Female'], *gender['Male'], confidence)
+        intervals['city_rates'] = {g: wilson_ci(a, n, confidence) for g, (a, n) in sorted(city.items())}
+        if len(city) > 1:
+            intervals['city_std'] = _std_ci_analytic(city, confidence)
+
+    def _round(ci):
+        return [round(float(ci[0]), 3), round(float(ci[1]), 3)]
+    if 'disparate_impact' in intervals:
+        intervals['disparate_impact'] = _round(intervals['disparate_impact'])
+    if 'city_std' in intervals:
+        intervals['city_std'] = _round(intervals['city_std'])
+    intervals['city_rates'] = {g: _round(ci) for g, ci in intervals['city_rates'].items()}
+    return intervals
+
+def run_bias_detection(df=None, chunksize=None, ci=None, resamples=BOOTSTRAP_RESAMPLES,
+                       confidence=CONFIDENCE, seed=0):
+    # df may be a DataFrame or any iterable of DataFrame chunks
     if df is None:
-        df = pd.read_csv('data/loan_data.csv')
+        df = iter_loan_chunks(chunksize=chunksize) if chunksize else load_loan_data(columns=BIAS_COLUMNS)
+    frames = [df] if isinstance(df, pd.DataFrame) else df
 
+    counts = {}
+    for frame in frames:
+        accumulate_group_counts(counts, frame)
+    return summarise_bias(counts, ci, resamples, confidence, seed)
+
+def summarise_bias(counts, ci=None, resamples=BOOTSTRAP_RESAMPLES, confidence=CONFIDENCE, seed=0,
+                   min_group=MIN_GROUP_DECISIONS):
+    # ci=None flags on point estimates; 'bootstrap' or 'analytic' only flag when
+    # the whole confidence interval is past the threshold. When either gender
+    # has fewer than min_group decisions the ratio is None and never flagged.
+    if ci is not None and ci not in CI_METHODS:
+        raise ValueError(f"Unknown CI method: {ci}")
     results = {}
+    intervals = bias_intervals(counts, ci, resamples, confidence, seed) if ci else {}
 
     # 1. Gender Bias
-    gender_groups = df.groupby('gender')['loan_approved'].mean()
+    gender_groups = _approval_rates(counts.get('gender', {}))
     results['gender_approval_rates'] = gender_groups.to_dict()
 
+    gender_sizes = {g: n for g, (_, n) in counts.get('gender', {}).items()}
+    comparable  = min(gender_sizes.get('Male', 0), gender_sizes.get('Female', 0)) >= max(min_group, 1)
     male_rate   = gender_groups.get('Male', 0)
     female_rate = gender_groups.get('Female', 0)
     disparate_impact = female_rate / male_rate if male_rate > 0 else 0
 
-    results['disparate_impact_ratio'] = round(disparate_impact, 3)
-    results['gender_bias_detected']   = disparate_impact < 0.8  # RBI threshold
+    results['disparate_impact_ratio'] = round(disparate_impact, 3) if comparable else None
+    if not comparable:
+        results['gender_bias_detected'] = False
+    elif 'disparate_impact' in intervals:
+        results['disparate_impact_ci']  = intervals['disparate_impact']
+        results['gender_bias_detected'] = intervals['disparate_impact'][1] < DI_THRESHOLD
+    else:
+        results['gender_bias_detected'] = disparate_impact < DI_THRESHOLD
 
     # 2. City Bias
-    city_groups = df.groupby('city')['loan_approved'].mean()
+    city_groups = _approval_rates(counts.get('city', {}))
     results['city_approval_rates'] = city_groups.to_dict()
     city_std = city_groups.std()
-    results['city_bias_detected'] = city_std > 0.05
+    if ci:
+        results['city_approval_ci'] = intervals['city_rates']
+    if 'city_std' in intervals:
+        results['city_std_ci']        = intervals['city_std']
+        results['city_bias_detected'] = intervals['city_std'][0] > CITY_STD_THRESHOLD
+    else:
+        results['city_bias_detected'] = city_std > CITY_STD_THRESHOLD
 
     # 3. Education Bias
-    edu_groups = df.groupby('education')['loan_approved'].mean()
+    edu_groups = _approval_rates(counts.get('education', {}))
     results['education_approval_rates'] = edu_groups.to_dict()
 
     # 4. Overall Summary
-    results['total_records']    = len(df)
-    results['overall_approval'] = round(df['loan_approved'].mean() * 100, 2)
+    approved, total = counts.get('overall', (0, 0))
+    results['total_records']    = total
+    results['overall_approval'] = round(approved / total * 100, 2) if total else 0.0
     results['bias_flags']       = []
 
     if results['gender_bias_detected']:
         results['bias_flags'].append({
             'type'    : 'Gender Bias',
             'severity': 'HIGH',
-            'detail'  : f"Disparate Impact Ratio: {results['disparate_impact_ratio']} (Threshold: 0.80)",
+            'detail'  : f"Disparate Impact Ratio: {results['disparate_impact_ratio']} (Threshold: 0.80)"
+                        + (f" | {int(confidence * 100)}% CI: {results['disparate_impact_ci']}" if 'disparate_impact_ci' in results else ''),
             'regulation': 'RBI Digital Lending Guidelines 2022'
         })
     if results['city_bias_detected']:
         results['bias_flags'].append({
             'type'    : 'Geographic Bias',
             'severity': 'MEDIUM',
-            'detail'  : f"City approval rate std deviation: {round(city_std, 3)}",
+            'detail'  : f"City approval rate std deviation: {round(city_std, 3)}"
+                        + (f" | {int(confidence * 100)}% CI: {results['city_std_ci']}" if 'city_std_ci' in results else ''),
             'regulation': 'Fair Lending Guidelines'
         })
 
@@ -54,12 +203,22 @@ def run_bias_detection(df=None):
 
 
 if __name__ == '__main__':
-    res = run_bias_detection()
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help='Stream the loan file in chunks of this many rows')
+    parser.add_argument('--ci', choices=CI_METHODS, default=None,
+                        help='Only flag when the confidence interval clears the threshold')
+    parser.add_argument('--resamples', type=int, default=BOOTSTRAP_RESAMPLES)
+    args = parser.parse_args()
+
+    res = run_bias_detection(chunksize=args.chunksize, ci=args.ci, resamples=args.resamples)
     print("\n=== BIAS DETECTION REPORT ===")
     print(f"Status          : {res['status']}")
     print(f"Overall Approval: {res['overall_approval']}%")
     print(f"Gender Rates    : {res['gender_approval_rates']}")
-    print(f"Disparate Impact: {res['disparate_impact_ratio']}")
+    print(f"Disparate Impact: {res['disparate_impact_ratio']}"
+          + (f" (CI {res['disparate_impact_ci']})" if 'disparate_impact_ci' in res else ''))
     print(f"Bias Flags      : {len(res['bias_flags'])} found")
     for flag in res['bias_flags']:
         print(f"  [{flag['severity']}] {flag['type']}: {flag['detail']}")
\ No newline at end of file
@@ -0,0 +1,136 @@
+# modules/bias_monitor.py
+from collections import deque
+
+import pandas as pd
+from modules.bias_detector import summarise_bias
+
+MONITOR_ATTRIBUTES  = ['gender', 'city']
+WINDOW_MODES        = ('rolling', 'tumbling')
+MIN_GROUP_DECISIONS = 30    # quiet windows with fewer Male or Female decisions get no DI ratio
+
+class RollingBiasMonitor:
+    # Per-group approved/total counters over a time window of decisions.
+    # Each record is an O(1) counter update; in rolling mode every record is
+    # evicted exactly once, so eviction is amortised O(1) as well.
+
+    def __init__(self, window='1D', mode='rolling', attributes=MONITOR_ATTRIBUTES,
+                 min_group=MIN_GROUP_DECISIONS):
+        if mode not in WINDOW_MODES:
+            raise ValueError(f"Unknown window mode: {mode}")
+        self.window     = pd.Timedelta(window)
+        self.mode       = mode
+        self.attributes = list(attributes)
+        self.min_group  = min_group
+        self.records    = deque()
+        self.counts     = {attr: {} for attr in self.attributes}
+        self.overall    = [0, 0]
+        self.window_start = None
+
+    def _apply(self, record, sign):
+        approved = int(record['loan_approved'])
+        for attr in self.attributes:
+            acc = self.counts[attr]
+            group = record[attr]
+            a, n = acc.get(group, (0, 0))
+            a, n = a + sign * approved, n + sign
+            if n:
+                acc[group] = (a, n)
+            else:
+                del acc[group]
+        self.overall[0] += sign * approved
+        self.overall[1] += sign
+
+    def evict(self, now):
+        while self.records and self.records[0]['timestamp'] <= now - self.window:
+            self._apply(self.records.popleft(), -1)
+
+    def update(self, record):
+        ts = record['timestamp']
+        if self.window_start is None:
+            self.window_start = ts if self.mode == 'rolling' else ts.floor(self.window)
+        # Only a rolling window needs its records back for eviction; a tumbling
+        # window is reset wholesale, so its counts are all it keeps
+        if self.mode == 'rolling':
+            self.evict(ts)
+            self.records.append(record)
+        self._apply(record, +1)
+
+    def reset(self, window_start):
+        self.records.clear()
+        self.counts  = {attr: {} for attr in self.attributes}
+        self.overall = [0, 0]
+        self.window_start = window_start
+
+    def snapshot(self, window_end):
+        counts = {attr: dict(acc) for attr, acc in self.counts.items()}
+        counts['overall'] = tuple(self.overall)
+        summary = summarise_bias(counts, min_group=self.min_group)
+        start = window_end - self.window if self.mode == 'rolling' else self.window_start
+        return {
+            'window_start'          : str(start),
+            'window_end'            : str(window_end),
+            'records'               : self.overall[1],
+            'gender_approval_rates' : summary['gender_approval_rates'],
+            'city_approval_rates'   : summary['city_approval_rates'],
+            'disparate_impact_ratio': summary['disparate_impact_ratio'],
+            'bias_flags'            : summary['bias_flags'],
+            'status'                : summary['status'],
+        }
+
+def monitor_stream(records, window='1D', mode='tumbling', step=None, attributes=MONITOR_ATTRIBUTES,
+                   min_group=MIN_GROUP_DECISIONS):
+    # records: iterable of dicts with 'timestamp', the monitored attributes and
+    # 'loan_approved', in timestamp order. Yields one summary per tumbling
+    # window, or one every `step` (default: the window length) when rolling.
+    monitor = RollingBiasMonitor(window, mode, attributes, min_group)
+    step = pd.Timedelta(step) if step else monitor.window
+    next_emit = None
+
+    for record in records:
+        record = {**record, 'timestamp': pd.Timestamp(record['timestamp'])}
+        ts = record['timestamp']
+        if next_emit is None:
+            next_emit = (ts.floor(monitor.window) if mode == 'tumbling' else ts) + step
+
+        while ts >= next_emit:
+            if mode == 'rolling':
+                monitor.evict(next_emit)
+            if monitor.overall[1]:
+                yield monitor.snapshot(next_emit)
+            if mode == 'tumbling':
+                monitor.reset(next_emit)
+            next_emit += step
+        monitor.update(record)
+
+    if monitor.overall[1]:
+        yield monitor.snapshot(next_emit if mode == 'tumbling' else monitor.records[-1]['timestamp'])
+
+def iter_decisions(df, timestamp_col='timestamp', attributes=MONITOR_ATTRIBUTES):
+    columns = [timestamp_col] + list(attributes) + ['loan_approved']
+    for row in df[columns].sort_values(timestamp_col).itertuples(index=False):
+        record = dict(zip(columns, row))
+        record['timestamp'] = record.pop(timestamp_col)
+        yield record
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('path', help='CSV of timestamped loan decisions')
+    parser.add_argument('--timestamp-col', default='timestamp')
+    parser.add_argument('--window', default='1D')
+    parser.add_argument('--mode', choices=WINDOW_MODES, default='tumbling')
+    parser.add_argument('--step', default=None, help='Emit interval for rolling windows')
+    parser.add_argument('--min-group', type=int, default=MIN_GROUP_DECISIONS,
+                        help='Minimum Male and Female decisions in a window to compute the DI ratio')
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.path, parse_dates=[args.timestamp_col])
+    print("\n=== ROLLING BIAS MONITOR ===")
+    print(f"{'Window End':<22} {'Records':>8} {'DI':>7} {'Status':>7}  Flags")
+    print("-" * 70)
+    for w in monitor_stream(iter_decisions(df, args.timestamp_col), args.window, args.mode, args.step,
+                            min_group=args.min_group):
+        flags = ', '.join(f['type'] for f in w['bias_flags'])
+        di = 'N/A' if w['disparate_impact_ratio'] is None else w['disparate_impact_ratio']
+        print(f"{w['window_end']:<22} {w['records']:>8} {di:>7} {w['status']:>7}  {flags}")
@@ -1,7 +1,10 @@
 # modules/cia_monitor.py
 import os
+import mmap
 import hashlib
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 MONITORED_FILES = [
@@ -13,66 +16,264 @@ MONITORED_FILES = [
 
 HASH_STORE = 'database/file_hashes.json'
 
-def compute_hash(filepath):
-    sha256 = hashlib.sha256()
+HASH_ALGORITHM       = 'sha256'
+SUPPORTED_ALGORITHMS = ('sha256', 'blake2b')
+
+READ_BUFFER    = 4 * 1024 * 1024     # 4 MiB reads instead of 4 KiB keeps syscalls off the profile
+MMAP_THRESHOLD = 64 * 1024 * 1024    # hash larger files straight from a memory map
+
+def compute_hash(filepath, algorithm=HASH_ALGORITHM):
+    if algorithm not in SUPPORTED_ALGORITHMS:
+        raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+    digest = hashlib.new(algorithm)
+    try:
+        with open(filepath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                    digest.update(m)
+            else:
+                buf  = bytearray(READ_BUFFER)
+                view = memoryview(buf)
+                while n := f.readinto(buf):
+                    digest.update(view[:n])
+        return digest.hexdigest()
+    except FileNotFoundError:
+        return None
+
+def file_stat(filepath):
+    try:
+        st = os.stat(filepath)
+    except FileNotFoundError:
+        return None
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'inode': st.st_ino}
+
+def stat_unchanged(baseline_info, stat):
+    return stat is not None and all(baseline_info.get(k) == v for k, v in stat.items())
+
+# ── Merkle chunk trees ────────────────────────────────────
+# Leaves are hashes of fixed-size chunks, so a tampered file can be narrowed
+# down to the byte (and CSV line) ranges that changed. Edits that change the
+# file length shift every later chunk, so appends localise well but inserts
+# report everything after the insertion point. Leaves are produced in the
+# same read as the file digest, so tampered files are compared leaf by leaf;
+# the root only identifies the stored tree.
+
+MERKLE_CHUNK_SIZE = 8 * 1024 * 1024
+
+def chunk_hashes(filepath, algorithm=HASH_ALGORITHM, chunk_size=MERKLE_CHUNK_SIZE, indices=None):
+    # Returns {chunk_index: (leaf_hash, newline_count)}; only the given indices when provided
+    leaves = {}
+    with open(filepath, 'rb') as f:
+        n_chunks = -(-os.fstat(f.fileno()).st_size // chunk_size)
+        for i in (range(n_chunks) if indices is None else sorted(indices)):
+            if i >= n_chunks:
+                continue
+            f.seek(i * chunk_size)
+            chunk = f.read(chunk_size)
+            leaves[i] = (hashlib.new(algorithm, chunk).hexdigest(), chunk.count(b'\n'))
+    return leaves
+
+def hash_with_chunks(filepath, algorithm=HASH_ALGORITHM, chunk_size=MERKLE_CHUNK_SIZE):
+    # Whole-file digest and every chunk leaf from a single read of the file;
+    # returns (hash, {chunk_index: (leaf_hash, newline_count)}) or (None, None)
+    digest = hashlib.new(algorithm)
+    leaves = {}
+    buf  = bytearray(chunk_size)
+    view = memoryview(buf)
     try:
         with open(filepath, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                sha256.update(chunk)
-        return sha256.hexdigest()
+            while n := f.readinto(buf):
+                digest.update(view[:n])
+                leaves[len(leaves)] = (hashlib.new(algorithm, view[:n]).hexdigest(), buf.count(b'\n', 0, n))
     except FileNotFoundError:
+        return None, None
+    return digest.hexdigest(), leaves
+
+def merkle_root(leaves, algorithm=HASH_ALGORITHM):
+    level = list(leaves)
+    if not level:
+        return hashlib.new(algorithm).hexdigest()
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [hashlib.new(algorithm, (a + b).encode()).hexdigest()
+                 for a, b in zip(level[::2], level[1::2])]
+    return level[0]
+
+def build_merkle(filepath, algorithm=HASH_ALGORITHM, chunk_size=MERKLE_CHUNK_SIZE, leaves=None):
+    # leaves: chunk hashes already computed by hash_with_chunks, to skip re-reading the file
+    if leaves is None:
+        leaves = chunk_hashes(filepath, algorithm, chunk_size)
+    ordered = [leaves[i] for i in range(len(leaves))]
+    return {
+        'chunk_size': chunk_size,
+        'root'      : merkle_root([h for h, _ in ordered], algorithm),
+        'leaves'    : [h for h, _ in ordered],
+        'newlines'  : [n for _, n in ordered],
+    }
+
+def _contiguous(indices):
+    runs = []
+    for i in sorted(indices):
+        if runs and i == runs[-1][1] + 1:
+            runs[-1][1] = i
+        else:
+            runs.append([i, i])
+    return runs
+
+def locate_changes(filepath, baseline_info, chunks=None, current=None):
+    # Compare current chunk hashes with the stored leaves. Pass chunks=[...] to
+    # re-verify only those chunks, e.g. after restoring a reported range, or
+    # current= the leaves hash_with_chunks already computed to skip reading the file.
+    tree = baseline_info['merkle']
+    algorithm  = baseline_info.get('algorithm', 'sha256')
+    chunk_size = tree['chunk_size']
+    size = os.path.getsize(filepath)
+    n_old, n_new = len(tree['leaves']), -(-size // chunk_size)
+
+    indices = range(max(n_old, n_new)) if chunks is None else chunks
+    if current is None:
+        current = chunk_hashes(filepath, algorithm, chunk_size, indices)
+    changed = [i for i in indices
+               if i >= n_old or i not in current or current[i][0] != tree['leaves'][i]]
+
+    # Line numbers come from the baseline newline counts (line 1 is the CSV header)
+    line_starts = [1]
+    for n in tree['newlines']:
+        line_starts.append(line_starts[-1] + n)
+
+    ranges = []
+    for first, last in _contiguous(changed):
+        ranges.append({
+            'chunks'    : [first, last],
+            'byte_range': [first * chunk_size, min((last + 1) * chunk_size, max(size, baseline_info.get('size', 0)))],
+            'line_range': [line_starts[min(first, n_old)],
+                           line_starts[min(last + 1, n_old)] if last + 1 < n_old else None],
+        })
+    return {'changed_chunks': changed, 'chunks_checked': len(list(indices)), 'ranges': ranges}
+
+def integrity_status(current_hash, baseline_hash):
+    if current_hash is None:
+        return 'MISSING', True
+    if baseline_hash is None:
+        return 'NEW FILE', False
+    if current_hash != baseline_hash:
+        return 'TAMPERED', True
+    return 'INTACT', False
+
+def load_baseline():
+    if not os.path.exists(HASH_STORE):
+        print("[INFO] No baseline found — creating baseline now...")
+        save_baseline()
+    with open(HASH_STORE, 'r') as f:
+        return json.load(f)
+
+def _write_baseline(baseline):
+    # Written aside and renamed into place: concurrent readers (other checks,
+    # baseline_key) never see a partial file, and a crash mid-write leaves the
+    # previous baseline intact
+    os.makedirs(os.path.dirname(HASH_STORE) or '.', exist_ok=True)
+    tmp = f"{HASH_STORE}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(baseline, f, indent=2)
+    os.replace(tmp, HASH_STORE)
+
+def baseline_key():
+    # Digest of what the baseline asserts about each file (hash, algorithm, chunk
+    # tree) but not the stat fields run_cia_monitor refreshes on the fast path,
+    # so a check run never invalidates results keyed on it
+    try:
+        with open(HASH_STORE, 'r') as f:
+            baseline = json.load(f)
+    except (FileNotFoundError, ValueError):
         return None
+    asserted = {fp: [info.get('hash'), info.get('algorithm'), (info.get('merkle') or {}).get('root')]
+                for fp, info in baseline.items()}
+    return hashlib.sha1(json.dumps(asserted, sort_keys=True).encode()).hexdigest()
+
+def _hash_files(filepaths, algorithms, chunk_sizes):
+    # {filepath: (hash, leaves)}; files with a chunk size get their chunk leaves
+    # from the same read as the digest, the rest go through compute_hash.
+    # hashlib releases the GIL on large updates, so threads hash files concurrently.
+    def one(fp):
+        if chunk_sizes.get(fp):
+            return hash_with_chunks(fp, algorithms[fp], chunk_sizes[fp])
+        return compute_hash(fp, algorithms[fp]), None
+    if not filepaths:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(8, len(filepaths))) as pool:
+        futures = {fp: pool.submit(one, fp) for fp in filepaths}
+        return {fp: f.result() for fp, f in futures.items()}
 
-def save_baseline():
+def save_baseline(algorithm=HASH_ALGORITHM, merkle=False, chunk_size=MERKLE_CHUNK_SIZE):
     os.makedirs('database', exist_ok=True)
     hashes = {}
+    hashed = _hash_files(MONITORED_FILES, {fp: algorithm for fp in MONITORED_FILES},
+                         {fp: chunk_size for fp in MONITORED_FILES} if merkle else {})
+    current = {fp: h for fp, (h, _) in hashed.items()}
     for filepath in MONITORED_FILES:
-        h = compute_hash(filepath)
         hashes[filepath] = {
-            'hash'     : h,
+            'hash'     : current[filepath],
+            'algorithm': algorithm,
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'status'   : 'BASELINE'
+            'status'   : 'BASELINE',
+            **(file_stat(filepath) or {}),
         }
-    with open(HASH_STORE, 'w') as f:
-        json.dump(hashes, f, indent=2)
+        if merkle and current[filepath] is not None:
+            hashes[filepath]['merkle'] = build_merkle(filepath, algorithm, chunk_size, hashed[filepath][1])
+    _write_baseline(hashes)
     print(f"[OK] Baseline saved -> {HASH_STORE}")
     return hashes
 
-def run_cia_monitor():
+def run_cia_monitor(loan_df=None, deep=False):
     results = {}
     findings = []
 
     # Load baseline
-    if not os.path.exists(HASH_STORE):
-        print("[INFO] No baseline found — creating baseline now...")
-        save_baseline()
-
-    with open(HASH_STORE, 'r') as f:
-        baseline = json.load(f)
+    baseline = load_baseline()
 
     file_checks = []
+    refreshed   = False
+
+    # Fast path: unchanged size/mtime/inode means the baseline hash still holds.
+    # deep=True re-hashes regardless, e.g. to catch mtime-preserving edits.
+    # Everything else is re-hashed concurrently with the algorithm the baseline used.
+    stats = {fp: file_stat(fp) for fp in MONITORED_FILES}
+    to_hash = {
+        fp: baseline.get(fp, {}).get('algorithm', 'sha256')
+        for fp in MONITORED_FILES
+        if deep or not baseline.get(fp, {}).get('hash') or not stat_unchanged(baseline[fp], stats[fp])
+    }
+    # Files with a chunk tree get their leaves in the same pass, ready for locate_changes
+    rehashed = _hash_files(list(to_hash), to_hash,
+                           {fp: baseline[fp]['merkle']['chunk_size'] for fp in to_hash
+                            if 'merkle' in baseline.get(fp, {})})
 
     for filepath in MONITORED_FILES:
-        current_hash = compute_hash(filepath)
+        stat = stats[filepath]
         baseline_info = baseline.get(filepath, {})
         baseline_hash = baseline_info.get('hash')
 
+        leaves = None
+        if filepath in rehashed:
+            (current_hash, leaves), verified_by = rehashed[filepath], 'HASH'
+        else:
+            current_hash, verified_by = baseline_hash, 'STAT'
+
         file_exists = current_hash is not None
+        status, tampered = integrity_status(current_hash, baseline_hash)
 
-        if not file_exists:
-            status = 'MISSING'
-            tampered = True
-        elif baseline_hash is None:
-            status = 'NEW FILE'
-            tampered = False
-        elif current_hash != baseline_hash:
-            status = 'TAMPERED'
-            tampered = True
-        else:
-            status = 'INTACT'
-            tampered = False
+        # Content verified against the baseline: record stat so the next run takes the fast path
+        if status == 'INTACT' and verified_by == 'HASH' and not stat_unchanged(baseline_info, stat):
+            baseline_info.update(stat)
+            refreshed = True
+
+        # Merkle baseline: narrow a tampered file down to the changed ranges
+        changes = None
+        if status == 'TAMPERED' and 'merkle' in baseline_info:
+            changes = locate_changes(filepath, baseline_info, current=leaves)
 
-        file_size = os.path.getsize(filepath) if file_exists else 0
+        file_size = stat['size'] if file_exists else 0
 
         file_checks.append({
             'file'    : filepath,
@@ -81,26 +282,38 @@ def run_cia_monitor():
             'size_kb' : round(file_size / 1024, 2),
             'hash'    : current_hash[:16] + '...' if current_hash else 'N/A',
             'baseline': baseline_hash[:16] + '...' if baseline_hash else 'N/A',
+            'verified': verified_by,
+            'algorithm': baseline_info.get('algorithm', 'sha256'),
+            'changes'  : changes,
         })
 
+        detail = f"File status: {status}"
+        if changes:
+            spans = ', '.join(f"{r['byte_range'][0]}-{r['byte_range'][1]}" for r in changes['ranges'])
+            detail += f" | Changed bytes: {spans}"
+
         if tampered:
             findings.append({
                 'type'    : 'Integrity Violation',
                 'file'    : filepath,
                 'severity': 'CRITICAL',
-                'detail'  : f"File status: {status}",
+                'detail'  : detail,
                 'regulation': 'IT Act 2000 - Section 43A | CIA Triad'
             })
 
+    if refreshed:
+        _write_baseline(baseline)
+
     # Confidentiality Check
     confidentiality_checks = []
     sensitive_cols = ['aadhar_number', 'pan_number', 'contact_number']
     try:
-        import pandas as pd
-        df = pd.read_csv('data/loan_data.csv')
+        if loan_df is None:
+            from modules.data_loader import load_loan_data, CIA_COLUMNS
+            loan_df = load_loan_data(columns=CIA_COLUMNS)
         for col in sensitive_cols:
-            if col in df.columns:
-                exposed = df[col].astype(str).str.strip().replace('', float('nan')).dropna().shape[0]
+            if col in loan_df.columns:
+                exposed = loan_df[col].astype(str).str.strip().replace('', float('nan')).dropna().shape[0]
                 confidentiality_checks.append({
                     'column' : col,
                     'exposed': exposed,
@@ -128,15 +341,151 @@ def run_cia_monitor():
     return results
 
 
+# ── Watch mode ────────────────────────────────────────────
+# Re-hashes a file only when it changes. Uses filesystem events via the
+# optional watchdog package (inotify on Linux) and falls back to polling
+# os.stat(), which never reads file contents while nothing changes.
+
+WATCH_POLL_INTERVAL = 2.0
+WATCH_DEBOUNCE      = 0.5
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+
+def _watch_targets(paths):
+    # Absolute paths throughout, so targets match event paths however they were given
+    files, dirs = set(), set()
+    for path in paths:
+        if os.path.isdir(path):
+            dirs.add(os.path.abspath(path))
+            files.update(os.path.abspath(os.path.join(path, name)) for name in os.listdir(path)
+                         if os.path.isfile(os.path.join(path, name)))
+        else:
+            files.add(os.path.abspath(path))
+    return files, dirs
+
+def check_file(filepath, baseline):
+    baseline_info = baseline.get(filepath, {})
+    algorithm     = baseline_info.get('algorithm', HASH_ALGORITHM)
+    leaves        = None
+    if 'merkle' in baseline_info:
+        current_hash, leaves = hash_with_chunks(filepath, algorithm, baseline_info['merkle']['chunk_size'])
+    else:
+        current_hash = compute_hash(filepath, algorithm)
+    status, tampered = integrity_status(current_hash, baseline_info.get('hash'))
+    changes = None
+    if status == 'TAMPERED' and 'merkle' in baseline_info:
+        changes = locate_changes(filepath, baseline_info, current=leaves)
+    return {
+        'file'      : filepath,
+        'status'    : status,
+        'tampered'  : tampered,
+        'changes'   : changes,
+        'checked_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+def _print_event(event):
+    print(f"[{event['checked_at']}] {event['status']:10} | {event['file']}")
+
+def _start_observer(files, dirs, changed):
+    handler = FileSystemEventHandler()
+
+    def dispatch(event):
+        for path in (getattr(event, 'src_path', None), getattr(event, 'dest_path', None)):
+            if not path or event.is_directory:
+                continue
+            path = os.path.abspath(path)
+            if path in files or os.path.dirname(path) in dirs:
+                changed.put(path)
+
+    handler.dispatch = dispatch
+    observer = Observer()
+    for directory in dirs | {os.path.dirname(f) for f in files}:
+        observer.schedule(handler, directory, recursive=False)
+    observer.start()
+    return observer
+
+def watch(paths=None, on_event=_print_event, interval=WATCH_POLL_INTERVAL, use_events=True, stop=None):
+    # paths may mix files and directories; stop is an optional threading.Event
+    import queue
+    import threading
+
+    stop = stop or threading.Event()
+    baseline = {os.path.abspath(k): v for k, v in load_baseline().items()}
+    files, dirs = _watch_targets(paths or MONITORED_FILES)
+    last_seen = {fp: file_stat(fp) for fp in files}
+
+    def handle(filepath):
+        stat = file_stat(filepath)
+        if stat == last_seen.get(filepath):
+            return      # metadata-only event, or already handled
+        last_seen[filepath] = stat
+        files.add(filepath)
+        event = check_file(filepath, baseline)
+        event['file'] = os.path.relpath(filepath)
+        on_event(event)
+
+    observer = _start_observer(files, dirs, changed := queue.Queue()) if use_events and Observer else None
+    try:
+        while not stop.is_set():
+            if observer:
+                # Block until an event arrives, then let a burst of writes settle
+                try:
+                    pending = {changed.get(timeout=1.0)}
+                except queue.Empty:
+                    continue
+                stop.wait(WATCH_DEBOUNCE)
+                while not changed.empty():
+                    pending.add(changed.get_nowait())
+            else:
+                stop.wait(interval)
+                pending = _watch_targets(list(files) + list(dirs))[0] | set(last_seen)
+            for filepath in sorted(pending):
+                handle(filepath)
+    finally:
+        if observer:
+            observer.stop()
+            observer.join()
+
+
 if __name__ == '__main__':
-    res = run_cia_monitor()
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--deep', action='store_true',
+                        help='Re-hash every file even if size/mtime/inode are unchanged')
+    parser.add_argument('--baseline', choices=SUPPORTED_ALGORITHMS, default=None,
+                        help='Write a fresh baseline with this hash algorithm, then check against it')
+    parser.add_argument('--merkle', action='store_true',
+                        help='With --baseline, also store chunk-level Merkle trees')
+    parser.add_argument('--chunk-size', type=int, default=MERKLE_CHUNK_SIZE)
+    parser.add_argument('--watch', nargs='*', metavar='PATH', default=None,
+                        help='Keep running and re-check files/directories as they change '
+                             '(defaults to the monitored files)')
+    args = parser.parse_args()
+
+    if args.watch is not None:
+        print(f"[INFO] Watching {'filesystem events' if Observer else 'by polling'} — Ctrl+C to stop")
+        try:
+            watch(args.watch or None)
+        except KeyboardInterrupt:
+            pass
+        raise SystemExit(0)
+
+    if args.baseline:
+        save_baseline(args.baseline, merkle=args.merkle, chunk_size=args.chunk_size)
+    res = run_cia_monitor(deep=args.deep)
     print("\n=== CIA TRIAD MONITOR REPORT ===")
     print(f"Checked At       : {res['checked_at']}")
     print(f"Integrity Status : {res['integrity_status']}")
     print()
     print("-- INTEGRITY (Files) --")
     for f in res['integrity']:
-        print(f"  {f['status']:10} | {f['file']:40} | {f['size_kb']} KB")
+        print(f"  {f['status']:10} | {f['file']:40} | {f['size_kb']} KB | {f['verified']}")
+        for r in (f['changes'] or {}).get('ranges', []):
+            print(f"             bytes {r['byte_range'][0]}-{r['byte_range'][1]} | lines {r['line_range'][0]}-{r['line_range'][1] or 'EOF'}")
     print()
     print("-- CONFIDENTIALITY (PII Exposure) --")
     for c in res['confidentiality']:
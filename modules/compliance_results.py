@@ -0,0 +1,195 @@
+# modules/compliance_results.py
+import os
+import json
+import pickle
+import hashlib
+import time
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from modules.bias_detector  import run_bias_detection
+from modules.pii_scanner    import run_pii_scan
+from modules.cia_monitor    import run_cia_monitor, file_stat, baseline_key, MONITORED_FILES
+from modules.risk_registry  import run_risk_registry
+from modules.aop_tracker    import run_aop_tracker
+from modules.data_loader    import load_loan_data, load_registry_data, load_aop_data
+from modules.risk_rules     import RISK_RULES
+from modules.registry_store import REGISTRY_DB
+
+RESULTS_CACHE = 'database/results_cache.pkl'
+# Bumped whenever the shape of a check's results changes, so caches written
+# by older code are never served
+RESULTS_VERSION = 4
+
+# Check name -> (function, dataset it reads)
+CHECKS = {
+    'bias': (run_bias_detection, 'loan'),
+    'pii' : (run_pii_scan,       'loan'),
+    'cia' : (run_cia_monitor,    'loan'),
+    'risk': (run_risk_registry,  'registry'),
+    'aop' : (run_aop_tracker,    'aop'),
+}
+
+# Last results computed in this process, so repeated callers skip the disk cache too.
+# The lock covers only reading and swapping the memo, never running checks.
+_memo = {}
+_memo_lock = threading.Lock()
+
+# Input fingerprint -> [lock, threads holding or waiting on it], so concurrent
+# cache misses on the same inputs run the checks once
+_flights = {}
+
+def input_fingerprint():
+    # Risk and AOP results depend on today's date and the risk rule file
+    # as well as the data files. The CIA baseline enters through its hashes
+    # rather than the hash store's stat, which every fast-path run rewrites.
+    # stat() is enough here: any content change moves size or mtime, and
+    # run_all_checks(deep=True) bypasses the cache for a full re-hash.
+    return {
+        'version' : RESULTS_VERSION,
+        'date'    : date.today().isoformat(),
+        'files'   : {f: file_stat(f) for f in MONITORED_FILES + [RISK_RULES]},
+        'baseline': baseline_key(),
+    }
+
+def _swap_memo(cached):
+    with _memo_lock:
+        _memo.clear()
+        _memo.update(cached)
+
+def _load_cached(key):
+    with _memo_lock:
+        memo = dict(_memo)
+    if memo.get('key') == key:
+        return memo['results']
+    try:
+        with open(RESULTS_CACHE, 'rb') as f:
+            cached = pickle.load(f)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        return None
+    if cached.get('key') != key:
+        return None
+    _swap_memo(cached)
+    return cached['results']
+
+def _save_cached(key, results):
+    _swap_memo({'key': key, 'results': results})
+    os.makedirs(os.path.dirname(RESULTS_CACHE), exist_ok=True)
+    # Written aside and renamed so a concurrent reader never sees a partial pickle
+    tmp = f"{RESULTS_CACHE}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'wb') as f:
+        pickle.dump({'key': key, 'results': results}, f)
+    os.replace(tmp, RESULTS_CACHE)
+
+@contextmanager
+def _single_flight(key):
+    token = json.dumps(key, sort_keys=True)
+    with _memo_lock:
+        flight = _flights.setdefault(token, [threading.Lock(), 0])
+        flight[1] += 1
+    try:
+        with flight[0]:
+            yield
+    finally:
+        with _memo_lock:
+            flight[1] -= 1
+            if not flight[1]:
+                del _flights[token]
+
+def _timed_check(name, data, options):
+    func, dataset = CHECKS[name]
+    start = time.perf_counter()
+    try:
+        result, error = func(data[dataset], **options.get(name, {})), None
+    except Exception as e:
+        result, error = {'status': 'ERROR', 'error': str(e)}, f"{type(e).__name__}: {e}"
+    return result, round(time.perf_counter() - start, 4), error
+
+DATASETS = {
+    'loan'    : load_loan_data,
+    'registry': load_registry_data,
+    'aop'     : load_aop_data,
+}
+
+def _load_datasets():
+    # A dataset that fails to load is left as None: each check given None
+    # loads its own data inside _timed_check, so the failure is recorded
+    # against the checks that need it, and the CIA check still runs to
+    # report the file MISSING
+    data = {}
+    for name, load in DATASETS.items():
+        try:
+            data[name] = load()
+        except Exception:
+            data[name] = None
+    return data
+
+def _result_digest(result):
+    return hashlib.sha1(json.dumps(result, sort_keys=True, default=str).encode()).hexdigest()
+
+def check_error(results, name):
+    # 'ERROR: <msg>' when a check failed in this run, else None. A failed check
+    # leaves only a {'status': 'ERROR'} stub, so consumers render this instead
+    error = results.get('errors', {}).get(name)
+    return f"ERROR: {error}" if error else None
+
+def run_all_checks(data=None, use_cache=True, parallel=True, max_workers=None, deep=False):
+    # The cache key fingerprints the files on disk, so results for frames
+    # passed in by a caller are neither served from nor written to it
+    use_cache = use_cache and data is None
+    key = input_fingerprint()
+    if not use_cache or deep:
+        return _run_checks(key, data, use_cache, parallel, max_workers, deep)
+
+    cached = _load_cached(key)
+    if cached is not None:
+        return cached
+    # Hits above never lock; a miss waits for any run already computing the
+    # same inputs and takes its results. The key is taken again because the
+    # first run may have written the CIA baseline it is keyed on.
+    with _single_flight(key):
+        key = input_fingerprint()
+        cached = _load_cached(key)
+        if cached is not None:
+            return cached
+        return _run_checks(key, data, use_cache, parallel, max_workers, deep)
+
+def _run_checks(key, data, use_cache, parallel, max_workers, deep):
+    options = {'cia': {'deep': deep}}
+
+    # The persisted registry store only ever holds the data files themselves;
+    # frames passed in by a caller are checked against throwaway stores
+    if data is None:
+        data = _load_datasets()
+        options.update({'risk': {'store': REGISTRY_DB}, 'aop': {'store': REGISTRY_DB}})
+
+    # Checks are independent; threads share the loaded frames and hashing releases the GIL
+    if parallel:
+        with ThreadPoolExecutor(max_workers=max_workers or len(CHECKS)) as pool:
+            futures = {name: pool.submit(_timed_check, name, data, options) for name in CHECKS}
+            outcomes = {name: f.result() for name, f in futures.items()}
+    else:
+        outcomes = {name: _timed_check(name, data, options) for name in CHECKS}
+
+    results = {name: outcome[0] for name, outcome in outcomes.items()}
+    results['timings'] = {name: outcome[1] for name, outcome in outcomes.items()}
+    results['errors']  = {name: outcome[2] for name, outcome in outcomes.items() if outcome[2]}
+    # Content digest per check, taken once here and cached with the results,
+    # so consumers can tell which checks changed without re-serialising them
+    results['versions'] = {name: _result_digest(results[name]) for name in CHECKS}
+
+    # The first CIA run writes the baseline, so only now is there one to key on
+    if key['baseline'] is None:
+        key['baseline'] = baseline_key()
+
+    # A failed module should be retried on the next run, not served from cache
+    if use_cache and not results['errors']:
+        _save_cached(key, results)
+    return results
+
+def clear_results_cache():
+    _swap_memo({})
+    if os.path.exists(RESULTS_CACHE):
+        os.remove(RESULTS_CACHE)
@@ -0,0 +1,168 @@
+# modules/data_loader.py
+import os
+import pandas as pd
+from modules.schema import LOAN_SCHEMA
+
+DATA_DIR      = 'data'
+LOAN_DATA     = 'data/loan_data.csv'
+REGISTRY_DATA = 'data/model_registry.csv'
+AOP_DATA      = 'data/aop_data.csv'
+
+# Columns each check reads from the loan dataset
+BIAS_COLUMNS = ['gender', 'city', 'education', 'loan_approved']
+PII_COLUMNS  = ['customer_id', 'aadhar_number', 'pan_number', 'contact_number']
+CIA_COLUMNS  = ['aadhar_number', 'pan_number', 'contact_number']
+FAIRNESS_COLUMNS = BIAS_COLUMNS + ['age']
+LOAN_COLUMNS = BIAS_COLUMNS + PII_COLUMNS
+
+# Typed dtypes for every loan column (categoricals, nullable Int8, float32); see modules/schema.py
+LOAN_DTYPES = LOAN_SCHEMA
+
+# Columnar copies live next to the CSV (data/loan_data.parquet, .arrow) and
+# are only used while they still match the CSV they were converted from
+COLUMNAR_FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+SOURCE_META_KEY  = b'source_csv_stat'
+
+# One parsed frame per dataset path, tagged with the (source, size, mtime) it
+# was read from, so a file is only parsed once per process and a changed file
+# replaces its old frame rather than adding another. A projected entry grows
+# as further columns are requested, so no column is read twice.
+_cache = {}
+
+def _file_key(path):
+    st = os.stat(path)
+    return (path, st.st_size, st.st_mtime_ns)
+
+def _source_stamp(csv_path):
+    st = os.stat(csv_path)
+    return f"{st.st_size}:{st.st_mtime_ns}".encode()
+
+def _read_schema(path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    if path.endswith('.parquet'):
+        return pq.read_schema(path)
+    with pa.memory_map(path) as source:
+        return pa.ipc.open_file(source).schema
+
+def columnar_source(path):
+    # Fresh columnar copy of a CSV if one exists and pyarrow is installed, else the CSV itself
+    if not path.endswith('.csv'):
+        return path
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return path
+    stem = path[:-len('.csv')]
+    for ext in COLUMNAR_FORMATS.values():
+        candidate = stem + ext
+        if os.path.exists(candidate):
+            meta = _read_schema(candidate).metadata or {}
+            if meta.get(SOURCE_META_KEY) == _source_stamp(path):
+                return candidate
+    return path
+
+def _read_columns(path, columns, dtype):
+    dtype = {c: t for c, t in (dtype or {}).items() if columns is None or c in columns}
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path, columns=columns)
+    elif path.endswith('.arrow'):
+        df = pd.read_feather(path, columns=columns)
+    else:
+        return pd.read_csv(path, usecols=columns, dtype=dtype)
+    # Columnar files keep their own types; align them with the CSV dtypes
+    return df.astype({c: t for c, t in dtype.items() if t is not str and c in df.columns})
+
+def read_dataset(path, columns=None, dtype=None):
+    source = columnar_source(path)
+    stamp  = _file_key(source)
+    cached = _cache.get(path)
+    if cached is not None and cached[0] != stamp:
+        cached = None
+
+    if columns is None:
+        if cached is None or cached[2]:
+            _cache[path] = (stamp, _read_columns(source, None, dtype), False)
+        return _cache[path][1]
+
+    columns = list(columns)
+    if cached is None:
+        _cache[path] = (stamp, _read_columns(source, columns, dtype), True)
+    else:
+        _, frame, projected = cached
+        missing = [c for c in columns if c not in frame.columns]
+        if missing:
+            frame = pd.concat([frame, _read_columns(source, missing, dtype)], axis=1)
+            _cache[path] = (stamp, frame, projected)
+
+    frame = _cache[path][1]
+    return frame if list(frame.columns) == columns else frame[columns]
+
+def load_loan_data(path=LOAN_DATA, columns=LOAN_COLUMNS):
+    return read_dataset(path, columns=columns, dtype=LOAN_DTYPES)
+
+def iter_loan_chunks(path=LOAN_DATA, chunksize=1_000_000, columns=BIAS_COLUMNS):
+    # Streaming reader for loan files larger than memory; not cached
+    dtype  = {c: LOAN_DTYPES[c] for c in columns if c in LOAN_DTYPES}
+    source = columnar_source(path)
+    if source.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        batches = pq.ParquetFile(source).iter_batches(batch_size=chunksize, columns=columns)
+        return (batch.to_pandas().astype({c: t for c, t in dtype.items() if t is not str})
+                for batch in batches)
+    if source.endswith('.arrow'):
+        # Arrow IPC is memory-mapped, so a single projected frame is already cheap
+        return iter([_read_columns(source, columns, dtype)])
+    return pd.read_csv(source, usecols=columns, dtype=dtype, chunksize=chunksize)
+
+def load_registry_data(path=REGISTRY_DATA):
+    return read_dataset(path)
+
+def load_aop_data(path=AOP_DATA):
+    return read_dataset(path)
+
+def load_datasets():
+    return {
+        'loan'    : load_loan_data(),
+        'registry': load_registry_data(),
+        'aop'     : load_aop_data(),
+    }
+
+def convert_to_columnar(path, fmt='parquet', dtype=None):
+    # One-off CSV -> Parquet / Arrow IPC conversion. The source CSV stat is kept
+    # in the schema metadata so the copy is ignored once the CSV changes.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pyarrow.feather as feather
+
+    df = pd.read_csv(path, dtype=dtype)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                           SOURCE_META_KEY: _source_stamp(path)})
+    target = path[:-len('.csv')] + COLUMNAR_FORMATS[fmt]
+    if fmt == 'parquet':
+        pq.write_table(table, target)
+    else:
+        feather.write_feather(table, target, compression='uncompressed')
+    return target
+
+def convert_datasets(fmt='parquet'):
+    return [
+        convert_to_columnar(LOAN_DATA, fmt, LOAN_DTYPES),
+        convert_to_columnar(REGISTRY_DATA, fmt),
+        convert_to_columnar(AOP_DATA, fmt),
+    ]
+
+def clear_cache():
+    _cache.clear()
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--convert', choices=list(COLUMNAR_FORMATS), default='parquet',
+                        help='Columnar format to convert the CSV datasets to')
+    args = parser.parse_args()
+
+    for target in convert_datasets(args.convert):
+        print(f"[OK] Converted -> {target}")
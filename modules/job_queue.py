@@ -0,0 +1,243 @@
+# modules/job_queue.py
+# Local job queue for report generation and heavy scans. Jobs live in a
+# SQLite file, so any process can submit or poll them and background
+# worker processes pick them up; no external broker is needed.
+import os
+import json
+import time
+import sqlite3
+import importlib
+import multiprocessing
+from contextlib import contextmanager
+
+QUEUE_DB      = 'database/job_queue.db'
+POLL_INTERVAL = 0.5
+
+PENDING, RUNNING, DONE, FAILED = 'PENDING', 'RUNNING', 'DONE', 'FAILED'
+
+# Task name -> 'module:function'; each function takes progress(fraction, message) plus its kwargs
+TASKS = {
+    'report'  : 'modules.job_queue:report_task',
+    'pii-scan': 'modules.job_queue:pii_scan_task',
+    'checks'  : 'modules.job_queue:checks_task',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    task      TEXT    NOT NULL,
+    args      TEXT    NOT NULL,
+    dedup_key TEXT    NOT NULL,
+    priority  INTEGER NOT NULL DEFAULT 0,
+    status    TEXT    NOT NULL,
+    progress  REAL    NOT NULL DEFAULT 0,
+    message   TEXT,
+    result    TEXT,
+    error     TEXT,
+    worker    INTEGER,
+    submitted REAL    NOT NULL,
+    started   REAL,
+    finished  REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_next    ON jobs (status, priority DESC, id);
+CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (dedup_key) WHERE status = 'PENDING';
+"""
+
+@contextmanager
+def _connect(path=QUEUE_DB):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript(SCHEMA)
+        yield conn
+    finally:
+        conn.close()
+
+@contextmanager
+def _transaction(path=QUEUE_DB):
+    # BEGIN IMMEDIATE takes the write lock up front, so two workers can
+    # never claim the same job and two submitters never both insert
+    with _connect(path) as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+def _encode(obj):
+    if hasattr(obj, 'item'):
+        return obj.item()
+    return str(obj)
+
+def _job_dict(row):
+    job = dict(row)
+    job['args']   = json.loads(job['args'])
+    job['result'] = json.loads(job['result']) if job['result'] else None
+    return job
+
+# ── Submitting and polling ─────────────────────────────────
+
+def enqueue(task, priority=0, path=QUEUE_DB, **kwargs):
+    # Identical pending jobs (same task and arguments) coalesce into one;
+    # the surviving job keeps the highest priority requested
+    if task not in TASKS:
+        raise ValueError(f"Unknown task: {task}")
+    args = json.dumps(kwargs, sort_keys=True, default=_encode)
+    dedup_key = f"{task}:{args}"
+    with _transaction(path) as conn:
+        row = conn.execute("SELECT id, priority FROM jobs WHERE dedup_key = ? AND status = 'PENDING'",
+                           (dedup_key,)).fetchone()
+        if row is not None:
+            if priority > row['priority']:
+                conn.execute('UPDATE jobs SET priority = ? WHERE id = ?', (priority, row['id']))
+            return row['id']
+        cur = conn.execute('INSERT INTO jobs (task, args, dedup_key, priority, status, submitted) '
+                           'VALUES (?, ?, ?, ?, ?, ?)',
+                           (task, args, dedup_key, priority, PENDING, time.time()))
+        return cur.lastrowid
+
+def job_status(job_id, path=QUEUE_DB):
+    with _connect(path) as conn:
+        row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+    return _job_dict(row) if row else None
+
+def list_jobs(status=None, limit=50, path=QUEUE_DB):
+    query, params = 'SELECT * FROM jobs', ()
+    if status:
+        query, params = query + ' WHERE status = ?', (status,)
+    with _connect(path) as conn:
+        rows = conn.execute(query + ' ORDER BY id DESC LIMIT ?', params + (limit,)).fetchall()
+    return [_job_dict(r) for r in rows]
+
+def wait_for(job_id, timeout=None, path=QUEUE_DB):
+    deadline = None if timeout is None else time.time() + timeout
+    while True:
+        job = job_status(job_id, path)
+        if job is None or job['status'] in (DONE, FAILED):
+            return job
+        if deadline is not None and time.time() > deadline:
+            return job
+        time.sleep(POLL_INTERVAL)
+
+# ── Workers ────────────────────────────────────────────────
+
+def claim(worker=None, path=QUEUE_DB):
+    with _transaction(path) as conn:
+        row = conn.execute("SELECT * FROM jobs WHERE status = 'PENDING' "
+                           "ORDER BY priority DESC, id LIMIT 1").fetchone()
+        if row is None:
+            return None
+        conn.execute('UPDATE jobs SET status = ?, worker = ?, started = ? WHERE id = ?',
+                     (RUNNING, worker or os.getpid(), time.time(), row['id']))
+    return _job_dict(row)
+
+def set_progress(job_id, progress, message=None, path=QUEUE_DB):
+    with _connect(path) as conn:
+        conn.execute('UPDATE jobs SET progress = ?, message = ? WHERE id = ?',
+                     (round(progress, 3), message, job_id))
+
+def _finish(job_id, result=None, error=None, path=QUEUE_DB):
+    with _connect(path) as conn:
+        conn.execute('UPDATE jobs SET status = ?, progress = ?, result = ?, error = ?, finished = ? WHERE id = ?',
+                     (FAILED if error else DONE, 0 if error else 1,
+                      None if error else json.dumps(result, default=_encode),
+                      error, time.time(), job_id))
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def requeue_stale(path=QUEUE_DB):
+    # Jobs left RUNNING by a worker that died go back on the queue
+    with _transaction(path) as conn:
+        stale = [r['id'] for r in conn.execute("SELECT id, worker FROM jobs WHERE status = 'RUNNING'")
+                 if not r['worker'] or not _pid_alive(r['worker'])]
+        conn.executemany("UPDATE jobs SET status = 'PENDING', worker = NULL, progress = 0 WHERE id = ?",
+                         [(i,) for i in stale])
+    return stale
+
+def _resolve(task):
+    module, func = TASKS[task].split(':')
+    return getattr(importlib.import_module(module), func)
+
+def run_job(job, path=QUEUE_DB):
+    progress = lambda fraction, message=None: set_progress(job['id'], fraction, message, path)
+    try:
+        result = _resolve(job['task'])(progress, **job['args'])
+    except Exception as e:
+        _finish(job['id'], error=f"{type(e).__name__}: {e}", path=path)
+    else:
+        _finish(job['id'], result=result, path=path)
+
+def worker_loop(path=QUEUE_DB, stop_when_idle=False, poll_interval=POLL_INTERVAL):
+    requeue_stale(path)
+    while True:
+        job = claim(path=path)
+        if job is None:
+            if stop_when_idle:
+                return
+            time.sleep(poll_interval)
+            continue
+        run_job(job, path)
+
+def start_workers(count=1, path=QUEUE_DB, stop_when_idle=False):
+    workers = []
+    for _ in range(count):
+        p = multiprocessing.Process(target=worker_loop, args=(path, stop_when_idle), name='compliance-worker')
+        p.start()
+        workers.append(p)
+    return workers
+
+# ── Tasks ──────────────────────────────────────────────────
+
+def report_task(progress, output_path='reports/compliance_report.pdf'):
+    from modules.compliance_results import run_all_checks
+    from modules.report_generator import generate_pdf_report
+    progress(0.1, 'Running compliance checks')
+    results = run_all_checks()
+    progress(0.6, 'Rendering PDF')
+    return {'report': generate_pdf_report(output_path=output_path, results=results)}
+
+def pii_scan_task(progress, source=None, sample_rows=None):
+    from modules.pii_scanner import run_pii_scan, run_pii_scan_partitioned
+    progress(0.1, f"Scanning {source or 'loan dataset'}")
+    if source:
+        return run_pii_scan_partitioned(source, sample_rows=sample_rows)
+    return run_pii_scan(sample_rows=sample_rows)
+
+def checks_task(progress, deep=False):
+    from modules.compliance_results import run_all_checks
+    progress(0.1, 'Running compliance checks')
+    results = run_all_checks(deep=deep)
+    return {'timings': results['timings'], 'errors': results['errors']}
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=0, help='Run N worker processes until interrupted')
+    parser.add_argument('--submit', choices=list(TASKS), help='Queue a job')
+    parser.add_argument('--priority', type=int, default=0)
+    parser.add_argument('--status', action='store_true', help='List recent jobs')
+    args = parser.parse_args()
+
+    if args.submit:
+        print(f"[OK] Queued {args.submit} -> job {enqueue(args.submit, args.priority)}")
+    if args.status:
+        print(f"{'ID':>5} {'Task':<10} {'Pri':>4} {'Status':<8} {'Progress':>8}  Message")
+        print("-" * 60)
+        for job in list_jobs():
+            print(f"{job['id']:>5} {job['task']:<10} {job['priority']:>4} {job['status']:<8} "
+                  f"{job['progress']:>8.0%}  {job['error'] or job['message'] or ''}")
+    if args.workers:
+        for p in start_workers(args.workers):
+            p.join()
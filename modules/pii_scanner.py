@@ -1,83 +1,225 @@
 # modules/pii_scanner.py
-import pandas as pd
+import os
 import re
+import glob
+import time
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from modules.data_loader import load_loan_data, PII_COLUMNS
 
-def run_pii_scan(df=None):
-    if df is None:
-        df = pd.read_csv('data/loan_data.csv')
+# PII types in match priority order: matched text is blanked before later types
+# are tested, so a 12-digit Aadhaar is not also reported as an account number
+PII_TYPES = {
+    'Aadhar Number': {
+        'pattern'   : r'(?<!\d)[2-9]\d{3}[\s-]?\d{4}[\s-]?\d{4}(?!\d)',
+        'severity'  : 'CRITICAL',
+        'regulation': 'DPDP Act 2023 + Aadhar Act 2016',
+        'action'    : 'Mask or remove immediately',
+    },
+    'PAN Number': {
+        'pattern'   : r'(?<![A-Za-z0-9])[A-Z]{5}\d{4}[A-Z](?![A-Za-z0-9])',
+        'severity'  : 'HIGH',
+        'regulation': 'DPDP Act 2023 + IT Act 2000',
+        'action'    : 'Encrypt or tokenize',
+    },
+    'Contact Number': {
+        'pattern'   : r'(?<!\d)(?:(?:\+|00)?91[\s-]?|0)?[6-9]\d{9}(?!\d)',
+        'severity'  : 'MEDIUM',
+        'regulation': 'DPDP Act 2023',
+        'action'    : 'Hash or pseudonymize',
+    },
+    'Email Address': {
+        'pattern'   : r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}',
+        'severity'  : 'MEDIUM',
+        'regulation': 'DPDP Act 2023',
+        'action'    : 'Hash or pseudonymize',
+    },
+    'IFSC Code': {
+        'pattern'   : r'(?<![A-Za-z0-9])[A-Z]{4}0[A-Z0-9]{6}(?![A-Za-z0-9])',
+        'severity'  : 'LOW',
+        'regulation': 'DPDP Act 2023',
+        'action'    : 'Review need for bank identifiers',
+    },
+    'Bank Account Number': {
+        'pattern'   : r'(?<!\d)\d{9,18}(?!\d)',
+        'severity'  : 'HIGH',
+        'regulation': 'DPDP Act 2023 + RBI KYC Directions',
+        'action'    : 'Encrypt or tokenize',
+    },
+}
 
-    results = {}
-    pii_findings = []
+for spec in PII_TYPES.values():
+    spec['regex'] = re.compile(spec['pattern'])
 
-    # 1. Aadhar Number Check
-    aadhar_found = df['aadhar_number'].astype(str).str.strip()
-    aadhar_exposed = aadhar_found[aadhar_found != ''].shape[0]
-    if aadhar_exposed > 0:
-        pii_findings.append({
-            'pii_type'  : 'Aadhar Number',
-            'column'    : 'aadhar_number',
-            'count'     : aadhar_exposed,
-            'severity'  : 'CRITICAL',
-            'regulation': 'DPDP Act 2023 + Aadhar Act 2016',
-            'action'    : 'Mask or remove immediately'
-        })
+# One alternation over every type, used to discard clean values in a single pass
+COMBINED_PATTERN = re.compile('|'.join(f"(?:{spec['pattern']})" for spec in PII_TYPES.values()))
 
-    # 2. PAN Number Check
-    pan_found = df['pan_number'].astype(str).str.strip()
-    pan_exposed = pan_found[pan_found != ''].shape[0]
-    if pan_exposed > 0:
-        pii_findings.append({
-            'pii_type'  : 'PAN Number',
-            'column'    : 'pan_number',
-            'count'     : pan_exposed,
-            'severity'  : 'HIGH',
-            'regulation': 'DPDP Act 2023 + IT Act 2000',
-            'action'    : 'Encrypt or tokenize'
-        })
+PAN_FORMAT   = re.compile(r'[A-Z]{5}[0-9]{4}[A-Z]')
+PAN_COLUMN   = re.compile(r'(^|_)pan(_|$)', re.IGNORECASE)
 
-    # 3. Phone Number Check
-    phone_found = df['contact_number'].astype(str).str.strip()
-    phone_exposed = phone_found[phone_found != ''].shape[0]
-    if phone_exposed > 0:
-        pii_findings.append({
-            'pii_type'  : 'Contact Number',
-            'column'    : 'contact_number',
-            'count'     : phone_exposed,
-            'severity'  : 'MEDIUM',
-            'regulation': 'DPDP Act 2023',
-            'action'    : 'Hash or pseudonymize'
-        })
+# Columns named like PII are always scanned in full on wide tables
+PII_COLUMN_HINT = re.compile(r'aadha?r|(^|_)pan(_|$)|phone|mobile|contact|e-?mail|ifsc|account|acct', re.IGNORECASE)
+
+WIDE_TABLE_COLUMNS = 50
+SAMPLE_ROWS        = 10_000
+
+def string_columns(df):
+    return [c for c in df.columns
+            if not isinstance(df[c].dtype, pd.CategoricalDtype)
+            and (pd.api.types.is_object_dtype(df[c]) or pd.api.types.is_string_dtype(df[c]))]
+
+def _non_empty(series):
+    values = series.dropna().astype(str).str.strip()
+    return values[values != '']
+
+def _sample_has_pii(values, sample_rows):
+    sample = values.sample(n=min(sample_rows, len(values)), random_state=0)
+    return bool(sample.str.contains(COMBINED_PATTERN).any())
+
+def scan_columns(df, sample_rows=SAMPLE_ROWS, wide_table_columns=WIDE_TABLE_COLUMNS):
+    # Returns {(column, pii_type): count}; 'Invalid PAN Format' is counted for PAN-named columns.
+    # sample_rows=None scans every row of every column, even on wide tables.
+    counts  = {}
+    skipped = []
+    columns = string_columns(df)
+    sample_first = sample_rows is not None and len(columns) > wide_table_columns and len(df) > sample_rows
+
+    for col in columns:
+        values = _non_empty(df[col])
+        if values.empty:
+            continue
+
+        # Wide tables: sample each column, confirm with a full scan only on a hit
+        if sample_first and not PII_COLUMN_HINT.search(str(col)) and not _sample_has_pii(values, sample_rows):
+            skipped.append(col)
+            continue
+
+        remaining = values[values.str.contains(COMBINED_PATTERN)]
+        for pii_type, spec in PII_TYPES.items():
+            if remaining.empty:
+                break
+            hit = remaining.str.contains(spec['regex'])
+            if hit.any():
+                counts[(col, pii_type)] = int(hit.sum())
+                remaining = pd.concat([remaining[~hit], remaining[hit].str.replace(spec['regex'], ' ', regex=True)])
 
-    # 4. PAN Format Validation (regex)
-    pan_pattern = re.compile(r'^[A-Z]{5}[0-9]{4}[A-Z]{1}$')
-    valid_pans = pan_found[pan_found != ''].apply(lambda x: bool(pan_pattern.match(str(x))))
-    invalid_pans = (~valid_pans).sum()
-    if invalid_pans > 0:
+        if PAN_COLUMN.search(str(col)):
+            invalid = int((~values.str.fullmatch(PAN_FORMAT)).sum())
+            if invalid:
+                counts[(col, 'Invalid PAN Format')] = invalid
+
+    return counts, skipped
+
+def build_findings(counts):
+    pii_findings = []
+    for (col, pii_type), count in counts.items():
+        if pii_type == 'Invalid PAN Format':
+            spec = {'severity': 'LOW', 'regulation': 'Data Quality Standard', 'action': 'Validate and clean data'}
+        else:
+            spec = PII_TYPES[pii_type]
         pii_findings.append({
-            'pii_type'  : 'Invalid PAN Format',
-            'column'    : 'pan_number',
-            'count'     : int(invalid_pans),
-            'severity'  : 'LOW',
-            'regulation': 'Data Quality Standard',
-            'action'    : 'Validate and clean data'
+            'pii_type'  : pii_type,
+            'column'    : col,
+            'count'     : count,
+            'severity'  : spec['severity'],
+            'regulation': spec['regulation'],
+            'action'    : spec['action']
         })
+    return pii_findings
 
-    results['total_records']   = len(df)
+def _scan_results(pii_findings, total_records, columns_scanned, skipped, elapsed):
+    results = {}
+    results['total_records']   = total_records
     results['pii_findings']    = pii_findings
     results['total_pii_fields']= len(pii_findings)
     results['critical_count']  = sum(1 for f in pii_findings if f['severity'] == 'CRITICAL')
     results['status']          = 'FAIL' if results['critical_count'] > 0 else 'WARN' if pii_findings else 'PASS'
+    results['columns_scanned'] = columns_scanned
+    results['columns_skipped'] = skipped
+    results['scan_seconds']    = round(elapsed, 4)
+    results['rows_per_sec']    = round(total_records / elapsed) if elapsed > 0 else None
+    return results
+
+def run_pii_scan(df=None, sample_rows=SAMPLE_ROWS):
+    if df is None:
+        df = load_loan_data(columns=PII_COLUMNS)
+
+    start = time.perf_counter()
+    counts, skipped = scan_columns(df, sample_rows=sample_rows)
+    elapsed = time.perf_counter() - start
+
+    return _scan_results(build_findings(counts), len(df),
+                         len(string_columns(df)) - len(skipped), skipped, elapsed)
 
+# ── Partitioned datasets ──────────────────────────────────
+
+PARTITION_EXTENSIONS = ('.csv', '.parquet', '.pq')
+
+def list_partitions(source):
+    # source is a directory (searched recursively) or a glob pattern
+    if os.path.isdir(source):
+        source = os.path.join(source, '**', '*')
+    return sorted(p for p in glob.glob(source, recursive=True)
+                  if os.path.isfile(p) and p.lower().endswith(PARTITION_EXTENSIONS))
+
+def read_partition(path):
+    if path.lower().endswith(('.parquet', '.pq')):
+        return pd.read_parquet(path)
+    # Every column as text: the scanner only matches text, and a digits-only
+    # column of any name may hold Aadhaar, phone or account numbers
+    return pd.read_csv(path, dtype=str)
+
+def _scan_partition(path, sample_rows):
+    # Runs in a worker process; returns only counts so little data crosses back
+    df = read_partition(path)
+    counts, skipped = scan_columns(df, sample_rows=sample_rows)
+    return path, len(df), len(string_columns(df)) - len(skipped), counts, skipped
+
+def run_pii_scan_partitioned(source, max_workers=None, sample_rows=SAMPLE_ROWS):
+    paths = list_partitions(source)
+    start = time.perf_counter()
+
+    counts, partitions = {}, {}
+    total_records, columns_scanned, skipped = 0, 0, []
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        scans = pool.map(_scan_partition, paths, [sample_rows] * len(paths))
+        for path, rows, scanned, part_counts, part_skipped in scans:
+            total_records   += rows
+            columns_scanned += scanned
+            skipped.extend(f"{path}:{col}" for col in part_skipped)
+            for key, count in part_counts.items():
+                counts[key] = counts.get(key, 0) + count
+                partitions.setdefault(key, []).append(path)
+
+    elapsed = time.perf_counter() - start
+    pii_findings = build_findings(counts)
+    for f in pii_findings:
+        f['partitions'] = partitions[(f['column'], f['pii_type'])]
+
+    results = _scan_results(pii_findings, total_records, columns_scanned, skipped, elapsed)
+    results['partitions_scanned'] = len(paths)
+    results['partitions_by_type'] = {}
+    for (col, pii_type), part_paths in partitions.items():
+        merged = results['partitions_by_type'].setdefault(pii_type, [])
+        merged.extend(p for p in part_paths if p not in merged)
     return results
 
 
 if __name__ == '__main__':
-    res = run_pii_scan()
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--source', default=None,
+                        help='Directory or glob of partitioned CSV/Parquet files to scan')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    res = run_pii_scan_partitioned(args.source, args.workers) if args.source else run_pii_scan()
     print("\n=== PII SCAN REPORT ===")
     print(f"Status         : {res['status']}")
     print(f"Total Records  : {res['total_records']}")
     print(f"PII Issues     : {res['total_pii_fields']} found")
     print(f"Critical Issues: {res['critical_count']}")
+    print(f"Throughput     : {res['rows_per_sec']} rows/sec ({res['columns_scanned']} columns scanned)")
     print()
     for f in res['pii_findings']:
         print(f"  [{f['severity']}] {f['pii_type']}")
@@ -85,4 +227,6 @@ if __name__ == '__main__':
         print(f"    Count     : {f['count']} records")
         print(f"    Regulation: {f['regulation']}")
         print(f"    Action    : {f['action']}")
+        if 'partitions' in f:
+            print(f"    Partitions: {len(f['partitions'])}")
         print()
\ No newline at end of file
@@ -0,0 +1,245 @@
+# modules/registry_store.py
+# Embedded SQLite store for the scored model registry and AOP reviews.
+# The CSVs stay the source of truth; each run syncs them in only when their
+# content (or the day) changed, and lookups and summary counts are indexed
+# queries instead of scans over Python lists.
+import os
+import json
+import pickle
+import sqlite3
+import hashlib
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pandas as pd
+
+REGISTRY_DB = 'database/registry.db'
+
+MODEL_COLUMNS = ['model_id', 'model_name', 'department', 'owner', 'status', 'risk_score', 'risk_rating',
+                 'color', 'days_to_audit', 'next_audit', 'pii_involved', 'rbi_applicable', 'reasons']
+REVIEW_COLUMNS = ['review_id', 'model_name', 'review_type', 'planned_date', 'completed_date', 'status',
+                  'status_color', 'urgency', 'reviewer', 'findings', 'severity', 'sev_color', 'quarter',
+                  'remarks', 'days_from_today', 'completed']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta  (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value BLOB);
+CREATE TABLE IF NOT EXISTS models (
+    position INTEGER PRIMARY KEY, model_id TEXT, model_name TEXT, department TEXT, owner TEXT,
+    status TEXT, risk_score INTEGER, risk_rating TEXT, color TEXT, days_to_audit INTEGER,
+    next_audit TEXT, pii_involved TEXT, rbi_applicable TEXT, reasons TEXT
+);
+CREATE TABLE IF NOT EXISTS reviews (
+    position INTEGER PRIMARY KEY, review_id TEXT, model_id TEXT, model_name TEXT, review_type TEXT,
+    planned_date TEXT, completed_date TEXT, status TEXT, status_color TEXT, urgency TEXT, reviewer TEXT,
+    findings INTEGER, severity TEXT, sev_color TEXT, quarter TEXT, remarks TEXT,
+    days_from_today INTEGER, completed INTEGER
+);
+"""
+
+# Dropped during a full rewrite and rebuilt once afterwards, which is much
+# cheaper than maintaining them row by row
+MODEL_INDEXES = {
+    'models_id'        : 'models (model_id)',
+    'models_owner'     : 'models (owner, risk_rating)',
+    'models_department': 'models (department, risk_rating, next_audit)',
+    'models_rating'    : 'models (risk_rating, next_audit)',
+    'models_next_audit': 'models (next_audit)',
+}
+REVIEW_INDEXES = {
+    'reviews_model'  : 'reviews (model_id)',
+    'reviews_status' : 'reviews (status, urgency)',
+    'reviews_quarter': 'reviews (quarter)',
+}
+
+@contextmanager
+def _connect(path=REGISTRY_DB):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        # Every connect, so a deleted or rotated store file is simply recreated;
+        # IF NOT EXISTS makes this a few catalogue lookups
+        conn.executescript(SCHEMA)
+        for indexes in (MODEL_INDEXES, REVIEW_INDEXES):
+            for name, target in indexes.items():
+                conn.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {target}')
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+def _sql_column(values):
+    # NaN/NA -> NULL and numpy scalars -> Python values for a whole column
+    series = pd.Series(values, dtype=object)
+    return series.where(series.notna(), None).tolist()
+
+def content_key(df, *extra):
+    # Cheap whole-frame fingerprint used to skip syncs when nothing changed
+    digest = pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()
+    return hashlib.sha1(digest + json.dumps([str(e) for e in extra]).encode()).hexdigest()
+
+def _rewrite(conn, table, columns, rows, indexes):
+    for name in indexes:
+        conn.execute(f'DROP INDEX IF EXISTS {name}')
+    conn.execute(f'DELETE FROM {table}')
+    conn.executemany(f"INSERT INTO {table} (position, {', '.join(columns)}) "
+                     f"VALUES ({', '.join('?' * (len(columns) + 1))})", rows)
+    for name, target in indexes.items():
+        conn.execute(f'CREATE INDEX {name} ON {target}')
+
+def _fetch_dicts(conn, query, params, columns):
+    cur = conn.cursor()
+    cur.row_factory = None
+    return [dict(zip(columns, row)) for row in cur.execute(query, params)]
+
+def get_meta(key, path=REGISTRY_DB):
+    with _connect(path) as conn:
+        row = conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+    return row['value'] if row else None
+
+def _set_meta(conn, key, value):
+    conn.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', (key, value))
+
+# ── Incremental scoring state ──────────────────────────────
+
+def load_scored_state(path=REGISTRY_DB):
+    # Per-model row hash and per-component points/reasons from the last
+    # scoring run, kept as one pickled frame: it is always read and written whole
+    with _connect(path) as conn:
+        row = conn.execute("SELECT value FROM state WHERE key = 'scored_registry'").fetchone()
+    return pickle.loads(row['value']) if row else None
+
+def save_scored_state(state, path=REGISTRY_DB):
+    with _connect(path) as conn:
+        conn.execute("INSERT OR REPLACE INTO state VALUES ('scored_registry', ?)",
+                     (sqlite3.Binary(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)),))
+
+# ── Models ─────────────────────────────────────────────────
+
+def _model_values(columns):
+    # columns: MODEL_COLUMNS -> list of values; reasons are stored newline-joined
+    return [_sql_column(['\n'.join(r) for r in columns[c]] if c == 'reasons' else columns[c])
+            for c in MODEL_COLUMNS]
+
+def write_models(columns, key=None, ids_key=None, path=REGISTRY_DB):
+    values = _model_values(columns)
+    with _connect(path) as conn:
+        _rewrite(conn, 'models', MODEL_COLUMNS, zip(range(len(values[0])), *values), MODEL_INDEXES)
+        _set_meta(conn, 'models_key', key)
+        _set_meta(conn, 'models_ids', ids_key)
+
+def update_models(columns, positions, key=None, path=REGISTRY_DB):
+    # In-place update of re-scored rows when the set and order of models is unchanged
+    values = _model_values(columns)
+    with _connect(path) as conn:
+        conn.executemany(f"UPDATE models SET {', '.join(f'{c} = ?' for c in MODEL_COLUMNS)} WHERE position = ?",
+                         zip(*values, (int(p) for p in positions)))
+        _set_meta(conn, 'models_key', key)
+
+def query_models(path=REGISTRY_DB, model_id=None, owner=None, department=None, risk_rating=None,
+                 due_within=None, today=None, limit=None):
+    # e.g. query_models(risk_rating='CRITICAL', department='Retail Lending', due_within=30)
+    # due_within=N selects models whose next audit falls on or before today + N days
+    where, params = [], []
+    for column, value in (('model_id', model_id), ('owner', owner),
+                          ('department', department), ('risk_rating', risk_rating)):
+        if value is not None:
+            where.append(f'{column} = ?')
+            params.append(value)
+    if due_within is not None:
+        where.append('next_audit <= ?')
+        params.append(((today or date.today()) + timedelta(days=due_within)).isoformat())
+    query = f"SELECT {', '.join(MODEL_COLUMNS)} FROM models"
+    if where:
+        query += ' WHERE ' + ' AND '.join(where)
+    query += ' ORDER BY position'
+    if limit:
+        query += f' LIMIT {int(limit)}'
+    with _connect(path) as conn:
+        models = _fetch_dicts(conn, query, params, MODEL_COLUMNS)
+    for m in models:
+        m['reasons'] = m['reasons'].split('\n') if m['reasons'] else []
+    return models
+
+def model_summary(path=REGISTRY_DB):
+    with _connect(path) as conn:
+        row = conn.execute("""
+            SELECT COUNT(*)                                       AS total_models,
+                   COALESCE(SUM(risk_rating = 'CRITICAL'), 0)     AS critical_models,
+                   COALESCE(SUM(risk_rating = 'HIGH'), 0)         AS high_models,
+                   COALESCE(SUM(risk_rating = 'MEDIUM'), 0)       AS medium_models,
+                   COALESCE(SUM(risk_rating = 'LOW'), 0)          AS low_models,
+                   COALESCE(SUM(days_to_audit < 0), 0)            AS overdue_audits,
+                   AVG(risk_score)                                AS avg_risk_score
+            FROM models""").fetchone()
+    return dict(row)
+
+# ── AOP reviews ────────────────────────────────────────────
+
+def write_reviews(columns, key=None, path=REGISTRY_DB):
+    # columns: 'model_id' plus REVIEW_COLUMNS -> list of values
+    values = [_sql_column(columns[c]) for c in ['model_id'] + REVIEW_COLUMNS]
+    rows = zip(range(len(values[0])), *values)
+    with _connect(path) as conn:
+        _rewrite(conn, 'reviews', ['model_id'] + REVIEW_COLUMNS, rows, REVIEW_INDEXES)
+        if key:
+            _set_meta(conn, 'reviews_key', key)
+
+def query_reviews(path=REGISTRY_DB, model_id=None, status=None, urgency=None, quarter=None):
+    where, params = [], []
+    for column, value in (('model_id', model_id), ('status', status), ('urgency', urgency), ('quarter', quarter)):
+        if value is not None:
+            where.append(f'{column} = ?')
+            params.append(value)
+    query = f"SELECT {', '.join(REVIEW_COLUMNS)} FROM reviews"
+    if where:
+        query += ' WHERE ' + ' AND '.join(where)
+    with _connect(path) as conn:
+        reviews = _fetch_dicts(conn, query + ' ORDER BY position', params, REVIEW_COLUMNS)
+    for r in reviews:
+        r['completed'] = bool(r['completed'])
+    return reviews
+
+def review_summary(path=REGISTRY_DB):
+    with _connect(path) as conn:
+        row = conn.execute("""
+            SELECT COUNT(*)                                   AS total_reviews,
+                   COALESCE(SUM(completed), 0)                AS completed,
+                   COALESCE(SUM(status = 'In Progress'), 0)   AS in_progress,
+                   COALESCE(SUM(status = 'Planned'), 0)       AS planned,
+                   COALESCE(SUM(urgency = 'OVERDUE'), 0)      AS overdue,
+                   COALESCE(SUM(urgency = 'DUE SOON'), 0)     AS due_soon,
+                   COALESCE(SUM(severity = 'High'), 0)        AS high_severity,
+                   COALESCE(SUM(findings), 0)                 AS total_findings
+            FROM reviews""").fetchone()
+        # The quarter label alone repeats every year, so group on the planned year too
+        quarters = conn.execute("""
+            SELECT CASE WHEN days_from_today IS NULL THEN NULL ELSE substr(planned_date, 1, 4) END AS year,
+                   quarter, COUNT(*) AS reviews, COALESCE(SUM(completed), 0) AS completed
+            FROM reviews GROUP BY year, quarter ORDER BY year, quarter""").fetchall()
+    return dict(row), {(q['year'], q['quarter']): {'reviews': q['reviews'], 'completed': q['completed']}
+                       for q in quarters}
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Query the model registry store')
+    parser.add_argument('--model-id')
+    parser.add_argument('--owner')
+    parser.add_argument('--department')
+    parser.add_argument('--rating', dest='risk_rating')
+    parser.add_argument('--due-within', type=int, help='Next audit within N days')
+    args = parser.parse_args()
+
+    from modules.risk_registry import sync_registry
+    sync_registry()
+    models = query_models(**vars(args))
+    print(f"\n=== REGISTRY QUERY: {len(models)} models ===")
+    print(f"{'ID':<10} {'Model':<35} {'Department':<18} {'Score':>6} {'Rating':>10} {'Next Audit':>12}")
+    print("-" * 96)
+    for m in models:
+        print(f"{m['model_id']:<10} {m['model_name']:<35} {m['department']:<18} "
+              f"{m['risk_score']:>6} {m['risk_rating']:>10} {m['next_audit']:>12}")
@@ -8,11 +8,7 @@ from reportlab.lib.units import cm
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, HRFlowable
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 
-from modules.bias_detector  import run_bias_detection
-from modules.pii_scanner    import run_pii_scan
-from modules.cia_monitor    import run_cia_monitor
-from modules.risk_registry  import run_risk_registry
-from modules.aop_tracker    import run_aop_tracker
+from modules.compliance_results import run_all_checks, check_error
 
 def get_styles():
     styles = getSampleStyleSheet()
@@ -82,10 +78,11 @@ def status_color(status):
         'OVERDUE' : colors.HexColor('#c62828'),
         'INTACT'  : colors.HexColor('#2e7d32'),
         'TAMPERED': colors.HexColor('#c62828'),
+        'ERROR'   : colors.HexColor('#c62828'),
     }
     return mapping.get(status, colors.HexColor('#37474f'))
 
-def generate_pdf_report(output_path='reports/compliance_report.pdf'):
+def generate_pdf_report(output_path='reports/compliance_report.pdf', data=None, results=None):
     os.makedirs('reports', exist_ok=True)
     styles  = get_styles()
     story   = []
@@ -103,20 +100,26 @@ def generate_pdf_report(output_path='reports/compliance_report.pdf'):
     story.append(Spacer(1, 1 * cm))
 
     # Cover summary table
-    bias_res = run_bias_detection()
-    pii_res  = run_pii_scan()
-    cia_res  = run_cia_monitor()
-    risk_res = run_risk_registry()
-    aop_res  = run_aop_tracker()
-
-    cover_data = [
-        ['Module', 'Status', 'Key Finding'],
-        ['Bias Detection',   bias_res['status'], f"Disparate Impact: {bias_res['disparate_impact_ratio']}"],
-        ['PII Scanner',      pii_res['status'],  f"{pii_res['total_pii_fields']} PII issues found"],
-        ['CIA Monitor',      cia_res['integrity_status'], f"{len(cia_res['findings'])} integrity issues"],
-        ['Risk Registry',    'INFO', f"{risk_res['critical_models']} Critical models"],
-        ['AOP Tracker',      'INFO', f"Completion: {aop_res['completion_rate']}%"],
+    if results is None:
+        results = run_all_checks(data)
+    bias_res = results['bias']
+    pii_res  = results['pii']
+    cia_res  = results['cia']
+    risk_res = results['risk']
+    aop_res  = results['aop']
+
+    # A failed check gets an ERROR row here and its error message in place of its section
+    cover_rows = [
+        ('Bias Detection', 'bias', lambda r: [r['status'], f"Disparate Impact: {r['disparate_impact_ratio']}"]),
+        ('PII Scanner',    'pii',  lambda r: [r['status'], f"{r['total_pii_fields']} PII issues found"]),
+        ('CIA Monitor',    'cia',  lambda r: [r['integrity_status'], f"{len(r['findings'])} integrity issues"]),
+        ('Risk Registry',  'risk', lambda r: ['INFO', f"{r['critical_models']} Critical models"]),
+        ('AOP Tracker',    'aop',  lambda r: ['INFO', f"Completion: {r['completion_rate']}%"]),
     ]
+    cover_data = [['Module', 'Status', 'Key Finding']]
+    for label, name, row in cover_rows:
+        error = check_error(results, name)
+        cover_data.append([label] + (['ERROR', error] if error else row(results[name])))
 
     cover_table = Table(cover_data, colWidths=[5*cm, 3*cm, 9*cm])
     cover_table.setStyle(TableStyle([
@@ -146,171 +149,190 @@ def generate_pdf_report(output_path='reports/compliance_report.pdf'):
     # ── SECTION 1: BIAS DETECTION ───────────────────────────
     story.append(section_header("1. BIAS DETECTION REPORT", styles))
     story.append(Spacer(1, 0.3 * cm))
+    if error := check_error(results, 'bias'):
+        story.append(Paragraph(error, styles['FindingText']))
+        story.append(Spacer(1, 0.5 * cm))
+    else:
+        story.append(Paragraph(
+            f"<b>Overall Status:</b> <font color='{'red' if bias_res['status']=='FAIL' else 'green'}'>{bias_res['status']}</font> | "
+            f"Overall Approval Rate: {bias_res['overall_approval']}% | "
+            f"Disparate Impact Ratio: {bias_res['disparate_impact_ratio']}",
+            styles['BodyText2']
+        ))
+        story.append(Spacer(1, 0.2 * cm))
 
-    story.append(Paragraph(
-        f"<b>Overall Status:</b> <font color='{'red' if bias_res['status']=='FAIL' else 'green'}'>{bias_res['status']}</font> | "
-        f"Overall Approval Rate: {bias_res['overall_approval']}% | "
-        f"Disparate Impact Ratio: {bias_res['disparate_impact_ratio']}",
-        styles['BodyText2']
-    ))
-    story.append(Spacer(1, 0.2 * cm))
+        # Gender table
+        gender_data = [['Gender', 'Approval Rate', 'Status']]
+        for g, rate in bias_res['gender_approval_rates'].items():
+            pct = f"{round(rate * 100, 1)}%"
+            st  = 'RISK' if g == 'Female' and bias_res['gender_bias_detected'] else 'OK'
+            gender_data.append([g, pct, st])
 
-    # Gender table
-    gender_data = [['Gender', 'Approval Rate', 'Status']]
-    for g, rate in bias_res['gender_approval_rates'].items():
-        pct = f"{round(rate * 100, 1)}%"
-        st  = 'RISK' if g == 'Female' and bias_res['gender_bias_detected'] else 'OK'
-        gender_data.append([g, pct, st])
-
-    g_table = Table(gender_data, colWidths=[5*cm, 6*cm, 6*cm])
-    g_table.setStyle(TableStyle([
-        ('BACKGROUND',    (0, 0), (-1, 0),  colors.HexColor('#283593')),
-        ('TEXTCOLOR',     (0, 0), (-1, 0),  colors.white),
-        ('FONTNAME',      (0, 0), (-1, 0),  'Helvetica-Bold'),
-        ('FONTSIZE',      (0, 0), (-1, -1), 9),
-        ('ROWBACKGROUNDS',(0, 1), (-1, -1), [colors.HexColor('#e8eaf6'), colors.white]),
-        ('GRID',          (0, 0), (-1, -1), 0.5, colors.HexColor('#9fa8da')),
-        ('TOPPADDING',    (0, 0), (-1, -1), 5),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-        ('LEFTPADDING',   (0, 0), (-1, -1), 8),
-    ]))
-    story.append(g_table)
-    story.append(Spacer(1, 0.3 * cm))
+        g_table = Table(gender_data, colWidths=[5*cm, 6*cm, 6*cm])
+        g_table.setStyle(TableStyle([
+            ('BACKGROUND',    (0, 0), (-1, 0),  colors.HexColor('#283593')),
+            ('TEXTCOLOR',     (0, 0), (-1, 0),  colors.white),
+            ('FONTNAME',      (0, 0), (-1, 0),  'Helvetica-Bold'),
+            ('FONTSIZE',      (0, 0), (-1, -1), 9),
+            ('ROWBACKGROUNDS',(0, 1), (-1, -1), [colors.HexColor('#e8eaf6'), colors.white]),
+            ('GRID',          (0, 0), (-1, -1), 0.5, colors.HexColor('#9fa8da')),
+            ('TOPPADDING',    (0, 0), (-1, -1), 5),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+            ('LEFTPADDING',   (0, 0), (-1, -1), 8),
+        ]))
+        story.append(g_table)
+        story.append(Spacer(1, 0.3 * cm))
 
-    for flag in bias_res['bias_flags']:
-        story.append(Paragraph(
-            f"⚠ [{flag['severity']}] {flag['type']}: {flag['detail']} | Regulation: {flag['regulation']}",
-            styles['FindingText']
-        ))
-    story.append(Spacer(1, 0.5 * cm))
+        for flag in bias_res['bias_flags']:
+            story.append(Paragraph(
+                f"⚠ [{flag['severity']}] {flag['type']}: {flag['detail']} | Regulation: {flag['regulation']}",
+                styles['FindingText']
+            ))
+        story.append(Spacer(1, 0.5 * cm))
 
     # ── SECTION 2: PII SCANNER ──────────────────────────────
     story.append(section_header("2. PII SCANNER REPORT", styles))
     story.append(Spacer(1, 0.3 * cm))
-    story.append(Paragraph(
-        f"<b>Status:</b> {pii_res['status']} | Total Records: {pii_res['total_records']} | "
-        f"PII Issues: {pii_res['total_pii_fields']} | Critical: {pii_res['critical_count']}",
-        styles['BodyText2']
-    ))
-    story.append(Spacer(1, 0.2 * cm))
+    if error := check_error(results, 'pii'):
+        story.append(Paragraph(error, styles['FindingText']))
+        story.append(Spacer(1, 0.5 * cm))
+    else:
+        story.append(Paragraph(
+            f"<b>Status:</b> {pii_res['status']} | Total Records: {pii_res['total_records']} | "
+            f"PII Issues: {pii_res['total_pii_fields']} | Critical: {pii_res['critical_count']}",
+            styles['BodyText2']
+        ))
+        story.append(Spacer(1, 0.2 * cm))
+
+        pii_data = [['PII Type', 'Column', 'Records', 'Severity', 'Action']]
+        for f in pii_res['pii_findings']:
+            pii_data.append([f['pii_type'], f['column'], str(f['count']), f['severity'], f['action']])
+
+        if len(pii_data) > 1:
+            p_table = Table(pii_data, colWidths=[3.5*cm, 3.5*cm, 2*cm, 2.5*cm, 5.5*cm])
+            p_table.setStyle(TableStyle([
+                ('BACKGROUND',    (0, 0), (-1, 0),  colors.HexColor('#283593')),
+                ('TEXTCOLOR',     (0, 0), (-1, 0),  colors.white),
+                ('FONTNAME',      (0, 0), (-1, 0),  'Helvetica-Bold'),
+                ('FONTSIZE',      (0, 0), (-1, -1), 8),
+                ('ROWBACKGROUNDS',(0, 1), (-1, -1), [colors.HexColor('#fce4ec'), colors.white]),
+                ('GRID',          (0, 0), (-1, -1), 0.5, colors.HexColor('#ef9a9a')),
+                ('TOPPADDING',    (0, 0), (-1, -1), 4),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+                ('LEFTPADDING',   (0, 0), (-1, -1), 6),
+                ('WORDWRAP',      (0, 0), (-1, -1), True),
+            ]))
+            story.append(p_table)
+        story.append(Spacer(1, 0.5 * cm))
+
+    # ── SECTION 3: CIA MONITOR ──────────────────────────────
+    story.append(section_header("3. CIA TRIAD MONITOR", styles))
+    story.append(Spacer(1, 0.3 * cm))
+    if error := check_error(results, 'cia'):
+        story.append(Paragraph(error, styles['FindingText']))
+        story.append(Spacer(1, 0.5 * cm))
+    else:
+        story.append(Paragraph(
+            f"<b>Integrity Status:</b> {cia_res['integrity_status']} | "
+            f"Checked At: {cia_res['checked_at']}",
+            styles['BodyText2']
+        ))
+        story.append(Spacer(1, 0.2 * cm))
 
-    pii_data = [['PII Type', 'Column', 'Records', 'Severity', 'Action']]
-    for f in pii_res['pii_findings']:
-        pii_data.append([f['pii_type'], f['column'], str(f['count']), f['severity'], f['action']])
+        cia_data = [['File', 'Status', 'Size (KB)', 'Hash (Preview)']]
+        for f in cia_res['integrity']:
+            cia_data.append([f['file'], f['status'], str(f['size_kb']), f['hash']])
 
-    if len(pii_data) > 1:
-        p_table = Table(pii_data, colWidths=[3.5*cm, 3.5*cm, 2*cm, 2.5*cm, 5.5*cm])
-        p_table.setStyle(TableStyle([
+        c_table = Table(cia_data, colWidths=[6*cm, 2.5*cm, 2.5*cm, 6*cm])
+        c_table.setStyle(TableStyle([
             ('BACKGROUND',    (0, 0), (-1, 0),  colors.HexColor('#283593')),
             ('TEXTCOLOR',     (0, 0), (-1, 0),  colors.white),
             ('FONTNAME',      (0, 0), (-1, 0),  'Helvetica-Bold'),
             ('FONTSIZE',      (0, 0), (-1, -1), 8),
-            ('ROWBACKGROUNDS',(0, 1), (-1, -1), [colors.HexColor('#fce4ec'), colors.white]),
-            ('GRID',          (0, 0), (-1, -1), 0.5, colors.HexColor('#ef9a9a')),
+            ('ROWBACKGROUNDS',(0, 1), (-1, -1), [colors.HexColor('#e8f5e9'), colors.white]),
+            ('GRID',          (0, 0), (-1, -1), 0.5, colors.HexColor('#a5d6a7')),
             ('TOPPADDING',    (0, 0), (-1, -1), 4),
             ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
             ('LEFTPADDING',   (0, 0), (-1, -1), 6),
-            ('WORDWRAP',      (0, 0), (-1, -1), True),
         ]))
-        story.append(p_table)
-    story.append(Spacer(1, 0.5 * cm))
-
-    # ── SECTION 3: CIA MONITOR ──────────────────────────────
-    story.append(section_header("3. CIA TRIAD MONITOR", styles))
-    story.append(Spacer(1, 0.3 * cm))
-    story.append(Paragraph(
-        f"<b>Integrity Status:</b> {cia_res['integrity_status']} | "
-        f"Checked At: {cia_res['checked_at']}",
-        styles['BodyText2']
-    ))
-    story.append(Spacer(1, 0.2 * cm))
-
-    cia_data = [['File', 'Status', 'Size (KB)', 'Hash (Preview)']]
-    for f in cia_res['integrity']:
-        cia_data.append([f['file'], f['status'], str(f['size_kb']), f['hash']])
-
-    c_table = Table(cia_data, colWidths=[6*cm, 2.5*cm, 2.5*cm, 6*cm])
-    c_table.setStyle(TableStyle([
-        ('BACKGROUND',    (0, 0), (-1, 0),  colors.HexColor('#283593')),
-        ('TEXTCOLOR',     (0, 0), (-1, 0),  colors.white),
-        ('FONTNAME',      (0, 0), (-1, 0),  'Helvetica-Bold'),
-        ('FONTSIZE',      (0, 0), (-1, -1), 8),
-        ('ROWBACKGROUNDS',(0, 1), (-1, -1), [colors.HexColor('#e8f5e9'), colors.white]),
-        ('GRID',          (0, 0), (-1, -1), 0.5, colors.HexColor('#a5d6a7')),
-        ('TOPPADDING',    (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-        ('LEFTPADDING',   (0, 0), (-1, -1), 6),
-    ]))
-    story.append(c_table)
-    story.append(Spacer(1, 0.5 * cm))
+        story.append(c_table)
+        story.append(Spacer(1, 0.5 * cm))
 
     # ── SECTION 4: RISK REGISTRY ────────────────────────────
     story.append(section_header("4. RISK REGISTRY", styles))
     story.append(Spacer(1, 0.3 * cm))
-    story.append(Paragraph(
-        f"Total Models: {risk_res['total_models']} | Critical: {risk_res['critical_models']} | "
-        f"High: {risk_res['high_models']} | Overdue Audits: {risk_res['overdue_audits']}",
-        styles['BodyText2']
-    ))
-    story.append(Spacer(1, 0.2 * cm))
-
-    risk_data = [['Model', 'Department', 'Score', 'Rating', 'Next Audit', 'Days Left']]
-    for m in risk_res['models']:
-        days = str(m['days_to_audit']) if m['days_to_audit'] is not None else 'N/A'
-        risk_data.append([
-            m['model_name'], m['department'],
-            str(m['risk_score']), m['risk_rating'],
-            m['next_audit'], days
-        ])
-
-    r_table = Table(risk_data, colWidths=[5*cm, 3.5*cm, 1.5*cm, 2.5*cm, 2.5*cm, 2*cm])
-    r_table.setStyle(TableStyle([
-        ('BACKGROUND',    (0, 0), (-1, 0),  colors.HexColor('#283593')),
-        ('TEXTCOLOR',     (0, 0), (-1, 0),  colors.white),
-        ('FONTNAME',      (0, 0), (-1, 0),  'Helvetica-Bold'),
-        ('FONTSIZE',      (0, 0), (-1, -1), 8),
-        ('ROWBACKGROUNDS',(0, 1), (-1, -1), [colors.HexColor('#fff8e1'), colors.white]),
-        ('GRID',          (0, 0), (-1, -1), 0.5, colors.HexColor('#ffe082')),
-        ('TOPPADDING',    (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-        ('LEFTPADDING',   (0, 0), (-1, -1), 6),
-        ('FONTSIZE',      (0, 1), (0, -1),  7),
-    ]))
-    story.append(r_table)
-    story.append(Spacer(1, 0.5 * cm))
+    if error := check_error(results, 'risk'):
+        story.append(Paragraph(error, styles['FindingText']))
+        story.append(Spacer(1, 0.5 * cm))
+    else:
+        story.append(Paragraph(
+            f"Total Models: {risk_res['total_models']} | Critical: {risk_res['critical_models']} | "
+            f"High: {risk_res['high_models']} | Overdue Audits: {risk_res['overdue_audits']}",
+            styles['BodyText2']
+        ))
+        story.append(Spacer(1, 0.2 * cm))
+
+        risk_data = [['Model', 'Department', 'Score', 'Rating', 'Next Audit', 'Days Left']]
+        for m in risk_res['models']:
+            days = str(m['days_to_audit']) if m['days_to_audit'] is not None else 'N/A'
+            risk_data.append([
+                m['model_name'], m['department'],
+                str(m['risk_score']), m['risk_rating'],
+                m['next_audit'], days
+            ])
+
+        r_table = Table(risk_data, colWidths=[5*cm, 3.5*cm, 1.5*cm, 2.5*cm, 2.5*cm, 2*cm])
+        r_table.setStyle(TableStyle([
+            ('BACKGROUND',    (0, 0), (-1, 0),  colors.HexColor('#283593')),
+            ('TEXTCOLOR',     (0, 0), (-1, 0),  colors.white),
+            ('FONTNAME',      (0, 0), (-1, 0),  'Helvetica-Bold'),
+            ('FONTSIZE',      (0, 0), (-1, -1), 8),
+            ('ROWBACKGROUNDS',(0, 1), (-1, -1), [colors.HexColor('#fff8e1'), colors.white]),
+            ('GRID',          (0, 0), (-1, -1), 0.5, colors.HexColor('#ffe082')),
+            ('TOPPADDING',    (0, 0), (-1, -1), 4),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+            ('LEFTPADDING',   (0, 0), (-1, -1), 6),
+            ('FONTSIZE',      (0, 1), (0, -1),  7),
+        ]))
+        story.append(r_table)
+        story.append(Spacer(1, 0.5 * cm))
 
     # ── SECTION 5: AOP TRACKER ──────────────────────────────
     story.append(section_header("5. AOP TRACKER", styles))
     story.append(Spacer(1, 0.3 * cm))
-    story.append(Paragraph(
-        f"Total Reviews: {aop_res['total_reviews']} | Completed: {aop_res['completed']} | "
-        f"In Progress: {aop_res['in_progress']} | Completion Rate: {aop_res['completion_rate']}%",
-        styles['BodyText2']
-    ))
-    story.append(Spacer(1, 0.2 * cm))
-
-    aop_data = [['Review ID', 'Model', 'Type', 'Status', 'Severity', 'Findings']]
-    for r in aop_res['reviews']:
-        aop_data.append([
-            r['review_id'], r['model_name'][:25],
-            r['review_type'][:20], r['status'],
-            r['severity'], str(r['findings'])
-        ])
-
-    a_table = Table(aop_data, colWidths=[2*cm, 5*cm, 4*cm, 2.5*cm, 2*cm, 1.5*cm])
-    a_table.setStyle(TableStyle([
-        ('BACKGROUND',    (0, 0), (-1, 0),  colors.HexColor('#283593')),
-        ('TEXTCOLOR',     (0, 0), (-1, 0),  colors.white),
-        ('FONTNAME',      (0, 0), (-1, 0),  'Helvetica-Bold'),
-        ('FONTSIZE',      (0, 0), (-1, -1), 8),
-        ('ROWBACKGROUNDS',(0, 1), (-1, -1), [colors.HexColor('#e3f2fd'), colors.white]),
-        ('GRID',          (0, 0), (-1, -1), 0.5, colors.HexColor('#90caf9')),
-        ('TOPPADDING',    (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-        ('LEFTPADDING',   (0, 0), (-1, -1), 6),
-    ]))
-    story.append(a_table)
-    story.append(Spacer(1, 0.5 * cm))
+    if error := check_error(results, 'aop'):
+        story.append(Paragraph(error, styles['FindingText']))
+        story.append(Spacer(1, 0.5 * cm))
+    else:
+        story.append(Paragraph(
+            f"Total Reviews: {aop_res['total_reviews']} | Completed: {aop_res['completed']} | "
+            f"In Progress: {aop_res['in_progress']} | Completion Rate: {aop_res['completion_rate']}%",
+            styles['BodyText2']
+        ))
+        story.append(Spacer(1, 0.2 * cm))
+
+        aop_data = [['Review ID', 'Model', 'Type', 'Status', 'Severity', 'Findings']]
+        for r in aop_res['reviews']:
+            aop_data.append([
+                r['review_id'], r['model_name'][:25],
+                r['review_type'][:20], r['status'],
+                r['severity'], str(r['findings'])
+            ])
+
+        a_table = Table(aop_data, colWidths=[2*cm, 5*cm, 4*cm, 2.5*cm, 2*cm, 1.5*cm])
+        a_table.setStyle(TableStyle([
+            ('BACKGROUND',    (0, 0), (-1, 0),  colors.HexColor('#283593')),
+            ('TEXTCOLOR',     (0, 0), (-1, 0),  colors.white),
+            ('FONTNAME',      (0, 0), (-1, 0),  'Helvetica-Bold'),
+            ('FONTSIZE',      (0, 0), (-1, -1), 8),
+            ('ROWBACKGROUNDS',(0, 1), (-1, -1), [colors.HexColor('#e3f2fd'), colors.white]),
+            ('GRID',          (0, 0), (-1, -1), 0.5, colors.HexColor('#90caf9')),
+            ('TOPPADDING',    (0, 0), (-1, -1), 4),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+            ('LEFTPADDING',   (0, 0), (-1, -1), 6),
+        ]))
+        story.append(a_table)
+        story.append(Spacer(1, 0.5 * cm))
 
     # ── FOOTER ──────────────────────────────────────────────
     story.append(HRFlowable(width="100%", thickness=1, color=colors.HexColor('#1a237e')))
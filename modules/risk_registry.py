@@ -1,6 +1,11 @@
 # modules/risk_registry.py
+import numpy as np
 import pandas as pd
 from datetime import datetime, date
+from modules.data_loader import load_registry_data
+from modules.risk_rules import get_scorer
+from modules.registry_store import (REGISTRY_DB, content_key, get_meta, load_scored_state, save_scored_state,
+                                    write_models, update_models, query_models, model_summary)
 
 def calculate_risk_score(model):
     score = 0
@@ -51,64 +56,166 @@ def calculate_risk_score(model):
 
     return min(score, 100), reasons, days_to_audit
 
-def run_risk_registry():
-    df = pd.read_csv('data/model_registry.csv')
-    results = []
-
-    for _, model in df.iterrows():
-        risk_score, reasons, days_to_audit = calculate_risk_score(model)
-
-        if risk_score >= 80:
-            risk_rating = 'CRITICAL'
-            color       = 'RED'
-        elif risk_score >= 60:
-            risk_rating = 'HIGH'
-            color       = 'ORANGE'
-        elif risk_score >= 40:
-            risk_rating = 'MEDIUM'
-            color       = 'YELLOW'
+def score_registry(df, today=None, rules=None):
+    # Columnar scoring under a rule set (default: data/risk_rules.json, which
+    # matches calculate_risk_score); see modules/risk_rules.py
+    return get_scorer(rules)(df, today)
+
+def _parts_frame(parts, derived, index):
+    cols = {}
+    for i, (points, reason) in parts.items():
+        cols[f'points_{i}'] = points
+        cols[f'reason_{i}'] = reason
+    return pd.DataFrame({**cols, **derived}, index=index)
+
+def incremental_score(df, today=None, rules=None, path=REGISTRY_DB):
+    # The last scoring run is kept in the registry store: per-model content
+    # hash plus each rule component's points and reason. Static components
+    # are re-scored only for rows whose hash changed; date-dependent
+    # components are recomputed in bulk once per calendar day.
+    # Returns (scored frame, mask of re-scored rows, whether every row's
+    # output may have changed: no usable state or a new day).
+    scorer = get_scorer(rules)
+    today  = today or date.today()
+    ids    = df['model_id']
+    if df.empty:
+        # Nothing to score, and an empty frame is no state to build on
+        return scorer(df, today), np.zeros(0, dtype=bool), True
+    if ids.duplicated().any():
+        return scorer(df, today), np.ones(len(df), dtype=bool), True
+
+    # int64 view so the hashes round-trip through SQLite INTEGER columns
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy().view(np.int64)
+    state  = load_scored_state(path)
+    if state is not None and state['rules'] != scorer.key:
+        state = None
+    same_day = state is not None and state['day'] == today.isoformat()
+
+    if state is None:
+        changed = np.ones(len(df), dtype=bool)
+        current = None
+    else:
+        previous = state['frame'].reindex(ids.to_numpy())
+        changed  = state['frame']['row_hash'].reindex(ids.to_numpy(), fill_value=0).to_numpy() != hashes
+        current  = previous.drop(columns='row_hash')
+
+    if changed.any():
+        rows  = df[changed]
+        fresh = _parts_frame(*scorer.evaluate(rows, today, dated=None if same_day else False),
+                             index=ids[changed].to_numpy())
+        if current is None:
+            current = fresh
         else:
-            risk_rating = 'LOW'
-            color       = 'GREEN'
-
-        results.append({
-            'model_id'     : model['model_id'],
-            'model_name'   : model['model_name'],
-            'department'   : model['department'],
-            'owner'        : model['owner'],
-            'status'       : model['status'],
-            'risk_score'   : risk_score,
-            'risk_rating'  : risk_rating,
-            'color'        : color,
-            'days_to_audit': days_to_audit,
-            'next_audit'   : model['next_audit'],
-            'pii_involved' : model['pii_involved'],
-            'rbi_applicable': model['rbi_applicable'],
-            'reasons'      : reasons
-        })
-
-    # Summary
-    summary = {
-        'total_models'   : len(results),
-        'critical_models': sum(1 for r in results if r['risk_rating'] == 'CRITICAL'),
-        'high_models'    : sum(1 for r in results if r['risk_rating'] == 'HIGH'),
-        'medium_models'  : sum(1 for r in results if r['risk_rating'] == 'MEDIUM'),
-        'low_models'     : sum(1 for r in results if r['risk_rating'] == 'LOW'),
-        'overdue_audits' : sum(1 for r in results if r['days_to_audit'] is not None and r['days_to_audit'] < 0),
-        'models'         : results
+            # Positional, column by column: label-aligned frame assignment
+            # fails on the nullable derived columns once they hold <NA>
+            at = np.flatnonzero(changed)
+            for col in fresh.columns:
+                current.iloc[at, current.columns.get_loc(col)] = fresh[col].to_numpy()
+    if not same_day:
+        dated = _parts_frame(*scorer.evaluate(df, today, dated=True), index=ids.to_numpy())
+        current[dated.columns] = dated
+
+    if changed.any() or not same_day:
+        save_scored_state({'rules': scorer.key, 'day': today.isoformat(),
+                           'frame': current.assign(row_hash=hashes)}, path)
+
+    parts, derived = {}, {}
+    for col in current.columns:
+        kind, _, i = col.partition('_')
+        if kind == 'points' and i.isdigit():
+            parts[int(i)] = (current[col].to_numpy(dtype=np.int64), current[f'reason_{i}'].to_numpy(dtype=object))
+        elif kind != 'reason' or not i.isdigit():
+            derived[col] = pd.array(current[col], dtype='Int64')
+    return scorer.finish(parts, derived, df.index), changed, not same_day
+
+def _model_columns(df, scored):
+    if 'days_to_audit' not in scored:
+        # Rule sets without an audit-window component
+        scored['days_to_audit'] = pd.array([pd.NA] * len(df), dtype='Int64')
+    columns = {
+        'model_id'      : df['model_id'].tolist(),
+        'model_name'    : df['model_name'].tolist(),
+        'department'    : df['department'].tolist(),
+        'owner'         : df['owner'].tolist(),
+        'status'        : df['status'].tolist(),
+        'risk_score'    : scored['risk_score'].tolist(),
+        'risk_rating'   : scored['risk_rating'].tolist(),
+        'color'         : scored['color'].tolist(),
+        'days_to_audit' : [None if pd.isna(d) else int(d) for d in scored['days_to_audit']],
+        'next_audit'    : df['next_audit'].tolist(),
+        'pii_involved'  : df['pii_involved'].tolist(),
+        'rbi_applicable': df['rbi_applicable'].tolist(),
+        'reasons'       : scored['reasons'].tolist(),
     }
+    return columns
 
-    return summary
+def sync_registry(df=None, today=None, rules=None, store=REGISTRY_DB):
+    # Bring the registry store up to date with the registry CSV; a no-op
+    # (one hash and one meta lookup) when neither the registry nor the day
+    # changed. Returns the number of models re-scored.
+    if df is None:
+        df = load_registry_data()
+    key = content_key(df, today or date.today(), get_scorer(rules).key)
+    if get_meta('models_key', store) == key:
+        return 0
+    scored, changed, refreshed = incremental_score(df, today, rules, store)
+    ids_key = content_key(df[['model_id']])
+    if refreshed or get_meta('models_ids', store) != ids_key:
+        write_models(_model_columns(df, scored), key, ids_key, store)
+    else:
+        update_models(_model_columns(df[changed], scored[changed]), np.flatnonzero(changed), key, store)
+    return int(changed.sum())
 
+def run_risk_registry(df=None, today=None, rules=None, incremental=None, store=None):
+    # Standard rules: score incrementally, sync into the registry store only
+    # when the registry (or the day) changed, and answer from indexed queries.
+    # The store defaults to REGISTRY_DB only for the registry CSV itself; a
+    # caller-supplied frame needs an explicit store, otherwise it is scored
+    # from scratch in memory like a what-if rule set.
+    if df is None:
+        df = load_registry_data()
+        store = store or REGISTRY_DB
+    if incremental is None:
+        incremental = rules is None
+    incremental = incremental and store is not None
+
+    if incremental:
+        rescored = sync_registry(df, today, rules, store)
+        summary = model_summary(store)
+        summary['rescored_models'] = rescored
+        summary['models'] = query_models(store)
+        return summary
+
+    scored  = score_registry(df, today, rules)
+    columns = _model_columns(df, scored)
+    results = [dict(zip(columns, row)) for row in zip(*columns.values())]
+    ratings = scored['risk_rating'].value_counts()
+    return {
+        'total_models'   : len(results),
+        'critical_models': int(ratings.get('CRITICAL', 0)),
+        'high_models'    : int(ratings.get('HIGH', 0)),
+        'medium_models'  : int(ratings.get('MEDIUM', 0)),
+        'low_models'     : int(ratings.get('LOW', 0)),
+        'overdue_audits' : int((scored['days_to_audit'] < 0).sum()),
+        'avg_risk_score' : float(scored['risk_score'].mean()) if len(scored) else None,
+        'rescored_models': len(df),
+        'models'         : results
+    }
 
 if __name__ == '__main__':
-    res = run_risk_registry()
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rules', default=None, help='Rule file to score with (what-if); JSON or YAML')
+    args = parser.parse_args()
+
+    res = run_risk_registry(rules=args.rules)
     print("\n=== RISK REGISTRY REPORT ===")
     print(f"Total Models   : {res['total_models']}")
     print(f"Critical       : {res['critical_models']}")
     print(f"High Risk      : {res['high_models']}")
     print(f"Medium Risk    : {res['medium_models']}")
     print(f"Overdue Audits : {res['overdue_audits']}")
+    print(f"Re-scored      : {res['rescored_models']}")
     print()
     print(f"{'Model':<35} {'Score':>6} {'Rating':>10} {'Next Audit':>12} {'Days Left':>10}")
     print("-" * 80)
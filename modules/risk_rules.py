@@ -0,0 +1,170 @@
+# modules/risk_rules.py
+# Declarative risk scoring. A rule file (JSON, or YAML when PyYAML is
+# installed) lists scoring components, each a column plus ordered cases
+# that award points and a reason; the first matching case wins. Rules are
+# compiled once into a scorer that evaluates every case as a NumPy mask
+# over the whole registry. data/risk_rules.json reproduces the original
+# calculate_risk_score weights.
+import os
+import json
+import string
+import hashlib
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+RISK_RULES = 'data/risk_rules.json'
+
+# Case keys -> vectorised condition over a column
+CONDITIONS = {
+    'equals'  : lambda values, arg: values == arg,
+    'in'      : lambda values, arg: np.isin(values, list(arg)),
+    'below'   : lambda values, arg: values < arg,
+    'at_least': lambda values, arg: values >= arg,
+}
+COLUMN_TYPES = ('value', 'days_until')
+CASE_FIELDS  = ('points', 'reason')
+
+def load_rules(path=RISK_RULES):
+    with open(path, 'r') as f:
+        if path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError(f"PyYAML is required to read {path}; use a JSON rule file instead")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+def _template(text):
+    # "Audit due in {days} days" -> [('Audit due in ', 'days'), (' days', None)]
+    return [(literal, field) for literal, field, _, _ in string.Formatter().parse(text)]
+
+def _render(pieces, fields, n):
+    out = np.full(n, '', dtype=object)
+    for literal, field in pieces:
+        out = out + literal
+        if field is not None:
+            if field not in fields:
+                raise ValueError(f"Unknown reason placeholder: {{{field}}}")
+            out = out + fields[field]
+    return out
+
+def _compile_case(case, name):
+    # A misspelt condition would otherwise leave a case that matches every row
+    unknown = sorted(set(case) - set(CONDITIONS) - set(CASE_FIELDS))
+    if unknown:
+        raise ValueError(f"Rule component '{name}': unknown case keys {unknown}; "
+                         f"conditions are {list(CONDITIONS)}")
+    tests = [(key, case[key]) for key in CONDITIONS if key in case]
+    if not tests:
+        raise ValueError(f"Rule component '{name}': every case needs a condition; use 'default' for the fallback")
+    if 'points' not in case:
+        raise ValueError(f"Rule component '{name}': every case needs 'points'")
+    return {
+        'tests' : [(CONDITIONS[key], arg) for key, arg in tests],
+        'points': case['points'],
+        'reason': _template(case.get('reason', '')),
+    }
+
+def compile_rules(rules):
+    components = []
+    for comp in rules['components']:
+        name = comp.get('name', comp['column'])
+        kind = comp.get('type', 'value')
+        if kind not in COLUMN_TYPES:
+            raise ValueError(f"Rule component '{name}': unknown type {kind}")
+        default = comp.get('default', {'points': 0, 'reason': ''})
+        components.append({
+            'name'   : name,
+            'column' : comp['column'],
+            'type'   : kind,
+            'as'     : comp.get('as'),
+            'cases'  : [_compile_case(c, name) for c in comp.get('cases', [])],
+            'default': {'points': default.get('points', 0), 'reason': _template(default.get('reason', ''))},
+        })
+    bands = sorted(rules.get('ratings', []), key=lambda b: b['min'], reverse=True)
+    default_rating = rules.get('default_rating', {'rating': 'LOW', 'color': 'GREEN'})
+    max_score = rules.get('max_score')
+
+    def evaluate(df, today=None, dated=None):
+        # Points and reason arrays per component, keyed by component position.
+        # dated=False / True restricts to static / date-dependent components so
+        # callers can recompute one kind without the other.
+        n = len(df)
+        today = pd.Timestamp(today or date.today())
+        parts, derived = {}, {}
+
+        for i, comp in enumerate(components):
+            if dated is not None and (comp['type'] == 'days_until') != dated:
+                continue
+            raw = df[comp['column']]
+            fields = {}
+            if comp['type'] == 'days_until':
+                # One parse for the whole column; unparseable dates match no case
+                days = (pd.to_datetime(raw, format='%Y-%m-%d', errors='coerce') - today).dt.days.to_numpy(dtype=float)
+                known = ~np.isnan(days)
+                whole = np.nan_to_num(days).astype(np.int64)
+                values = np.where(known, days, np.nan)
+                fields = {'days': whole.astype(str).astype(object), 'abs_days': np.abs(whole).astype(str).astype(object)}
+                if comp['as']:
+                    derived[comp['as']] = pd.array(values, dtype='Int64')
+            else:
+                values = raw.to_numpy(dtype=object)
+                known = np.ones(n, dtype=bool)
+
+            conditions = []
+            for case in comp['cases']:
+                mask = known.copy()
+                for test, arg in case['tests']:
+                    mask &= test(values, arg)
+                conditions.append(mask)
+
+            points = np.select(conditions, [c['points'] for c in comp['cases']], comp['default']['points'])
+            reason = np.select(conditions,
+                               [_render(c['reason'], fields, n) for c in comp['cases']],
+                               _render(comp['default']['reason'], fields, n))
+            parts[i] = (points.astype(np.int64), reason)
+        return parts, derived
+
+    def finish(parts, derived, index):
+        # Total, rating and ordered reasons from the per-component parts
+        n = len(index)
+        total = np.zeros(n, dtype=np.int64)
+        for points, _ in parts.values():
+            total += points
+        if max_score is not None:
+            total = np.minimum(total, max_score)
+        reasons = [parts[i][1].tolist() for i in sorted(parts)]
+        conditions = [total >= b['min'] for b in bands]
+        return pd.DataFrame({
+            'risk_score' : total,
+            'risk_rating': np.select(conditions, [b['rating'] for b in bands], default_rating['rating']),
+            'color'      : np.select(conditions, [b['color'] for b in bands], default_rating['color']),
+            **derived,
+            'reasons'    : [[r for r in row if r] for row in zip(*reasons)] if reasons else [[] for _ in range(n)],
+        }, index=index)
+
+    def score(df, today=None):
+        parts, derived = evaluate(df, today)
+        return finish(parts, derived, df.index)
+
+    score.evaluate = evaluate
+    score.finish   = finish
+    score.key      = hashlib.sha1(json.dumps(rules, sort_keys=True).encode()).hexdigest()
+    return score
+
+# Compiled scorers keyed by (path, mtime) so a rule file is compiled once per change
+_compiled = {}
+
+def get_scorer(rules=None):
+    # rules: None (default file), a path, a rules dict, or an already compiled scorer
+    if callable(rules):
+        return rules
+    if isinstance(rules, dict):
+        return compile_rules(rules)
+    path = rules or RISK_RULES
+    key = (path, os.stat(path).st_mtime_ns)
+    if key not in _compiled:
+        _compiled[key] = compile_rules(load_rules(path))
+    return _compiled[key]
@@ -0,0 +1,74 @@
+# modules/schema.py
+import pandas as pd
+
+# Compact in-memory types for the loan dataset, shared by data_generator.py
+# and the check modules. Integer widths cover the generator's ranges with
+# headroom (age 21-65, credit score 300-900, income <= 2.5 lakh,
+# loan amount <= 20 lakh); low-cardinality text columns are categoricals.
+# Integers use pandas' nullable types, which take one extra byte per value
+# for the mask, so a blank cell loads as <NA> instead of failing the read.
+LOAN_SCHEMA = {
+    'customer_id'       : str,
+    'gender'            : 'category',
+    'age'               : 'Int8',
+    'city'              : 'category',
+    'education'         : 'category',
+    'marital_status'    : 'category',
+    'annual_income'     : 'Int32',
+    'credit_score'      : 'Int16',
+    'loan_amount'       : 'Int32',
+    'employment_years'  : 'Int8',
+    'debt_ratio'        : 'float32',
+    'num_existing_loans': 'Int8',
+    'missed_payments'   : 'Int8',
+    'aadhar_number'     : str,
+    'pan_number'        : str,
+    'contact_number'    : str,
+    'loan_approved'     : 'Int8',
+}
+
+def apply_schema(df, schema=LOAN_SCHEMA):
+    return df.astype({c: t for c, t in schema.items() if c in df.columns})
+
+def memory_report(path='data/loan_data.csv', schema=LOAN_SCHEMA):
+    # Bytes per row with pandas' default inference vs the typed schema
+    before = pd.read_csv(path)
+    after  = pd.read_csv(path, dtype=schema)
+    rows   = max(len(before), 1)
+
+    columns = []
+    for col in before.columns:
+        b = int(before[col].memory_usage(index=False, deep=True))
+        a = int(after[col].memory_usage(index=False, deep=True))
+        columns.append({
+            'column'      : col,
+            'dtype_before': str(before[col].dtype),
+            'dtype_after' : str(after[col].dtype),
+            'bytes_before': b,
+            'bytes_after' : a,
+        })
+
+    total_before = sum(c['bytes_before'] for c in columns)
+    total_after  = sum(c['bytes_after'] for c in columns)
+    return {
+        'rows'               : len(before),
+        'bytes_per_row_before': round(total_before / rows, 1),
+        'bytes_per_row_after' : round(total_after / rows, 1),
+        'reduction_pct'      : round((1 - total_after / total_before) * 100, 1) if total_before else 0.0,
+        'columns'            : columns,
+    }
+
+
+if __name__ == '__main__':
+    res = memory_report()
+    print("\n=== LOAN DATASET MEMORY REPORT ===")
+    print(f"Rows              : {res['rows']}")
+    print(f"Bytes/row (before): {res['bytes_per_row_before']}")
+    print(f"Bytes/row (after) : {res['bytes_per_row_after']}")
+    print(f"Reduction         : {res['reduction_pct']}%")
+    print()
+    print(f"{'Column':<20} {'Before':<10} {'After':<10} {'Bytes/row':>10} {'->':^4} {'Bytes/row':<10}")
+    print("-" * 70)
+    for c in res['columns']:
+        print(f"{c['column']:<20} {c['dtype_before']:<10} {c['dtype_after']:<10} "
+              f"{c['bytes_before'] / res['rows']:>10.1f} {'->':^4} {c['bytes_after'] / res['rows']:<10.1f}")
@@ -0,0 +1,31 @@
+# tests/test_pii_scanner.py
+# Full scans (sample_rows=None) of wide tables, as requested by
+# POST /checks/pii/scan?full=true. Run from the repo root: python -m pytest tests
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+
+from modules.pii_scanner import WIDE_TABLE_COLUMNS, scan_columns
+from modules.job_queue import pii_scan_task
+
+def wide_table(rows=20):
+    # More string columns than WIDE_TABLE_COLUMNS, one of them holding Aadhaar numbers
+    df = pd.DataFrame({f'note_{i}': [f'text {i}-{r}' for r in range(rows)]
+                       for i in range(WIDE_TABLE_COLUMNS + 10)})
+    df['remarks'] = ['id 2345 6789 0123'] * rows
+    return df
+
+def test_full_scan_of_wide_table():
+    counts, skipped = scan_columns(wide_table(), sample_rows=None)
+    assert counts == {('remarks', 'Aadhar Number'): 20}
+    assert skipped == []
+
+def test_pii_scan_task_full_scan_of_wide_partition(tmp_path):
+    wide_table().to_csv(tmp_path / 'part-0.csv', index=False)
+    res = pii_scan_task(lambda *args: None, source=str(tmp_path), sample_rows=None)
+    assert res['partitions_scanned'] == 1
+    assert res['columns_skipped'] == []
+    assert [(f['column'], f['pii_type'], f['count']) for f in res['pii_findings']] == \
+        [('remarks', 'Aadhar Number', 20)]
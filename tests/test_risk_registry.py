@@ -0,0 +1,81 @@
+# tests/test_risk_registry.py
+# Incremental scoring against the registry store must match scoring the
+# whole registry from scratch, across edits, additions, removals, day
+# changes and unparseable audit dates. Run from the repo root: python -m pytest tests
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import date, timedelta
+
+import pandas as pd
+
+from benchmarks.risk_scoring_benchmark import make_registry
+from modules.risk_registry import incremental_score, run_risk_registry, score_registry
+
+TODAY = date(2026, 1, 15)
+MODEL_FIELDS = ['risk_score', 'risk_rating', 'color', 'days_to_audit', 'reasons']
+
+def models_by_id(res):
+    return {m['model_id']: {f: m[f] for f in MODEL_FIELDS} for m in res['models']}
+
+def assert_matches_full(df, today, state_store, registry_store):
+    # Separate stores, so the sync path re-scores the same rows incremental_score does
+    scored, _, _ = incremental_score(df, today, path=state_store)
+    pd.testing.assert_frame_equal(scored, score_registry(df, today), check_dtype=False)
+
+    incremental = run_risk_registry(df, today, store=registry_store)
+    full        = run_risk_registry(df, today, incremental=False)
+    assert models_by_id(incremental) == models_by_id(full)
+    for key in ['total_models', 'critical_models', 'high_models', 'medium_models', 'low_models',
+                'overdue_audits']:
+        assert incremental[key] == full[key], key
+
+def steps():
+    df = make_registry(200, seed=1)
+    yield df, TODAY
+
+    # Same day: edit several rows, two of them to unparseable or blank dates
+    df = df.copy()
+    df.loc[[3, 7, 11], 'risk_level'] = 'High'
+    df.loc[5, 'next_audit'] = 'TBD'
+    df.loc[9, 'next_audit'] = ''
+    df.loc[13, 'next_audit'] = (TODAY + timedelta(days=10)).isoformat()
+    yield df, TODAY
+
+    # Same day: add models, one with a blank date, and remove others
+    extra = make_registry(210, seed=2).iloc[200:].copy()
+    extra.loc[extra.index[0], 'next_audit'] = ''
+    df = pd.concat([df.drop(index=[20, 21, 22]), extra], ignore_index=True)
+    yield df, TODAY
+
+    # Same day, nothing changed
+    yield df, TODAY
+
+    # Next day: every date-dependent component moves, plus an edit
+    df = df.copy()
+    df.loc[0, 'status'] = 'Retired'
+    df.loc[1, 'next_audit'] = 'TBD'
+    yield df, TODAY + timedelta(days=1)
+
+    # Reordered rows on a later day
+    yield df.sample(frac=1, random_state=0).reset_index(drop=True), TODAY + timedelta(days=40)
+
+def test_incremental_matches_full_scoring(tmp_path):
+    state_store, registry_store = str(tmp_path / 'state.db'), str(tmp_path / 'registry.db')
+    for i, (df, today) in enumerate(steps()):
+        try:
+            assert_matches_full(df, today, state_store, registry_store)
+        except AssertionError as e:
+            raise AssertionError(f'step {i}: {e}') from e
+
+def test_same_day_edits_with_unparseable_dates(tmp_path):
+    store = str(tmp_path / 'registry.db')
+    df = make_registry(50, seed=3)
+    incremental_score(df, TODAY, path=store)
+
+    edited = df.copy()
+    edited.loc[[2, 4], 'next_audit'] = ['TBD', (TODAY + timedelta(days=5)).isoformat()]
+    scored, changed, refreshed = incremental_score(edited, TODAY, path=store)
+    assert changed.sum() == 2 and not refreshed
+    pd.testing.assert_frame_equal(scored, score_registry(edited, TODAY), check_dtype=False)